@@ -0,0 +1,142 @@
+"""
+Basins of attraction: Monte Carlo and grid estimates built on `mivp`
+
+Initial states are integrated in vectorized batches (`mivp.solve_batch`);
+each trajectory is stopped as soon as it enters the ball of radius
+`radius` around the equilibrium or leaves the ball of radius `divergence`,
+and is labelled accordingly:
+
+  - `CONVERGED` (1): the ball around the equilibrium has been reached,
+
+  - `UNDECIDED` (0): neither before `t_max`,
+
+  - `DIVERGED` (-1): the trajectory escaped (or its integration failed).
+"""
+
+# Python Standard Library
+import concurrent.futures
+import functools
+
+# Third-Party Libraries
+import numpy as np
+
+# Local Library
+import mivp
+
+CONVERGED, UNDECIDED, DIVERGED = 1, 0, -1
+
+
+def _classify_chunk(fun, y0s, equilibrium, radius, divergence, t_max, rtol, atol):
+    def mask(t, y):
+        r = np.linalg.norm(y - equilibrium[:, np.newaxis], axis=0)
+        return (r <= radius) | (r >= divergence)
+
+    results = mivp.solve_batch(
+        fun, (0.0, t_max), y0s, rtol=rtol, atol=atol, t_eval=[t_max], mask=mask
+    )
+    labels = np.full(len(y0s), UNDECIDED, dtype=np.int8)
+    for i, result in enumerate(results):
+        y = result.y[:, -1]
+        r = np.linalg.norm(y - equilibrium)
+        if result.status == -1 or not r < divergence:
+            labels[i] = DIVERGED
+        elif r <= radius:
+            labels[i] = CONVERGED
+    return labels
+
+
+def classify(fun, y0s, equilibrium, radius, t_max, divergence=1e6, rtol=1e-6,
+             atol=1e-9, chunk_size=2048, executor=None, workers=None):
+    """
+    Labels (`int8` array) of the initial states `y0s` (shape `(N, n)`).
+
+    `fun(t, y)` is the vectorized vector field (`y` of shape `(n, m)`, see
+    `mivp.solve_batch`). The states are integrated in chunks of
+    `chunk_size` samples, possibly dispatched to a `concurrent.futures`
+    executor (given, or a process pool with `workers` processes; `fun`
+    then needs to be picklable).
+    """
+    if executor is None and workers is not None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return classify(fun, y0s, equilibrium, radius, t_max, divergence,
+                            rtol, atol, chunk_size, executor)
+    y0s = np.asarray(y0s, dtype=np.float64)
+    equilibrium = np.asarray(equilibrium, dtype=np.float64)
+    classify_chunk = functools.partial(
+        _classify_chunk, fun, equilibrium=equilibrium, radius=radius,
+        divergence=divergence, t_max=t_max, rtol=rtol, atol=atol,
+    )
+    chunks = [y0s[i:i + chunk_size] for i in range(0, len(y0s), chunk_size)]
+    if executor is None:
+        labels = list(map(classify_chunk, chunks))
+    else:
+        labels = list(executor.map(classify_chunk, chunks))
+    return np.concatenate(labels) if labels else np.empty(0, dtype=np.int8)
+
+
+def sample(fun, low, high, n_samples, equilibrium, radius, t_max, seed=None,
+           **options):
+    """
+    Monte Carlo estimate: `n_samples` initial states drawn uniformly in the
+    box `[low, high]`. Return the states (shape `(n_samples, n)`), their
+    labels and the estimated fraction of the box in the basin.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+    y0s = rng.uniform(low, high, (n_samples, len(low)))
+    labels = classify(fun, y0s, equilibrium, radius, t_max, **options)
+    return y0s, labels, np.mean(labels == CONVERGED)
+
+
+def raster(fun, xs, ys, equilibrium, radius, t_max, levels=3, **options):
+    """
+    Labels of the 2d grid `xs x ys` (shape `(len(ys), len(xs))`, the
+    layout of `meshgrid`) with adaptive refinement.
+
+    A grid `2 ** levels` times coarser is computed first; each refinement
+    level then only integrates the new points whose enclosing coarse cell
+    has corners with different labels (near the basin boundary); the
+    other points inherit the common label of the corners. With `workers`,
+    a single process pool serves all the levels.
+    """
+    if options.get("executor") is None and options.get("workers") is not None:
+        workers = options.pop("workers")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            options["executor"] = executor
+            return raster(fun, xs, ys, equilibrium, radius, t_max, levels, **options)
+    xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+    labels = np.full((len(ys), len(xs)), -128, dtype=np.int8)  # -128: unknown
+
+    def compute(i, j):
+        y0s = np.c_[xs[j], ys[i]]
+        labels[i, j] = classify(fun, y0s, equilibrium, radius, t_max, **options)
+
+    def indices(size, stride):
+        index = np.arange(0, size, stride)
+        if index[-1] != size - 1:  # keep the grid edges
+            index = np.r_[index, size - 1]
+        return index
+
+    stride = 2 ** levels
+    I, J = np.meshgrid(indices(len(ys), stride), indices(len(xs), stride), indexing="ij")
+    compute(I.ravel(), J.ravel())
+    coarse = (indices(len(ys), stride), indices(len(xs), stride))
+    while stride > 1:
+        stride //= 2
+        fine = (indices(len(ys), stride), indices(len(xs), stride))
+        I, J = np.meshgrid(*fine, indexing="ij")
+        I, J = I.ravel(), J.ravel()
+        new = labels[I, J] == -128
+        I, J = I[new], J[new]
+        # Corners of the enclosing coarse cell
+        corners = []
+        for index, c in ((I, coarse[0]), (J, coarse[1])):
+            k = np.clip(np.searchsorted(c, index, side="right") - 1, 0, len(c) - 1)
+            corners.append((c[k], c[np.minimum(k + 1, len(c) - 1)]))
+        (i0, i1), (j0, j1) = corners
+        values = np.array([labels[i0, j0], labels[i0, j1], labels[i1, j0], labels[i1, j1]])
+        uniform = np.all(values == values[0], axis=0)
+        labels[I[uniform], J[uniform]] = values[0, uniform]
+        compute(I[~uniform], J[~uniform])
+        coarse = fine
+    return labels
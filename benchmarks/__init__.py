@@ -0,0 +1,19 @@
+"""
+Performance benchmarks (run from the project root, e.g. `python -m benchmarks.solve`)
+
+`python -m benchmarks.suite` runs the main cases and stores their results,
+to compare the successive commits (see `benchmarks.suite`).
+"""
+
+# Python Standard Library
+import time
+
+
+def best_of(function, repeat=3):
+    "Best wall-clock time (in seconds) of `repeat` calls to `function`"
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
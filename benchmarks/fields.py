@@ -0,0 +1,43 @@
+"""
+Phase portraits: per-point `Q` helper of the chapters vs `fields.Q`
+"""
+
+# Third-Party Libraries
+import numpy as np
+
+# Local Library
+import fields
+from benchmarks import best_of
+
+
+def Q(f, xs, ys):  # the chapters helper
+    X, Y = np.meshgrid(xs, ys)
+    v = np.vectorize
+    fx = v(lambda x, y: f([x, y])[0])
+    fy = v(lambda x, y: f([x, y])[1])
+    return X, Y, fx(X, Y), fy(X, Y)
+
+
+def lotka_volterra(xy):
+    x, y = xy
+    alpha, beta, delta, gamma = 2 / 3, 4 / 3, 1.0, 1.0
+    return np.array([alpha * x - beta * x * y, delta * x * y - gamma * y])
+
+
+def pendulum(theta_d_theta):
+    m, b, l, g = 1.0, 1.0, 1.0, 9.81
+    theta, d_theta = theta_d_theta
+    J = m * l * l
+    d2_theta = -b / J * d_theta - g / l * np.sin(theta)
+    return np.array([d_theta, d2_theta])
+
+
+if __name__ == "__main__":
+    n = 1000
+    xs = ys = np.linspace(-2.0, 2.0, n)
+    print(f"{n}x{n} grid")
+    print(f"{'field':>15} {'Q (s)':>8} {'fields.Q (s)':>13}")
+    for f in [lotka_volterra, pendulum]:
+        loop = best_of(lambda: Q(f, xs, ys), repeat=1)
+        fast = best_of(lambda: fields.Q(f, xs, ys))
+        print(f"{f.__name__:>15} {loop:>8.3f} {fast:>13.4f}")
@@ -0,0 +1,75 @@
+"""
+Fixed-step integration: `basic_solve_ivp` (1-2-Simulation.md) and `solve_ivp`
+loops vs the preallocated, batched `mivp.solve_fixed`
+"""
+
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+
+# Local Library
+import mivp
+from benchmarks import best_of
+from examples.pendulum import field
+
+
+def basic_solve_ivp(f, t_span, y0, dt=1e-3):  # from 1-2-Simulation.md
+    t0, t1 = t_span
+    ts, xs = [t0], [y0]
+    while ts[-1] < t1:
+        t, x = ts[-1], xs[-1]
+        t_next, x_next = t + dt, x + dt * f(x)
+        ts.append(t_next); xs.append(x_next)
+    return (np.array(ts), np.array(xs).T)
+
+
+def rotation(x):
+    return np.array([-x[1], x[0]])
+
+
+def pendulum(t, y):  # undamped
+    return field(t, y, b=0.0)
+
+
+def energy(y):
+    theta, d_theta = y
+    return 0.5 * d_theta ** 2 - 9.81 * np.cos(theta)
+
+
+if __name__ == "__main__":
+    # Euler, 10000 steps; basic_solve_ivp also accepts states of shape (n, N)
+    print(f"{'states':>10} {'basic_solve_ivp (s)':>20} {'solve_fixed (s)':>16}")
+    for N in [1, 100, 1000]:
+        y0s = np.random.default_rng(0).uniform(-1.0, 1.0, (N, 2))
+        slow = best_of(lambda: basic_solve_ivp(rotation, (0.0, 10.0), y0s.T))
+        fast = best_of(lambda: mivp.solve_fixed(lambda t, y: rotation(y), (0.0, 10.0), y0s, 1e-3, "Euler"))
+        print(f"{N:>10} {slow:>20.3f} {fast:>16.3f}")
+    print()
+
+    t = np.linspace(0.0, 10.0, 201)
+    print(f"{'pendulums':>10} {'solve_ivp (s)':>14} {'RK4 (s)':>8} {'max. error':>11}")
+    for N in [10, 100, 1000]:
+        y0s = np.random.default_rng(0).uniform(-2.0, 2.0, (N, 2))
+        loop = lambda: [
+            sci.solve_ivp(pendulum, (0.0, 10.0), y, t_eval=t, rtol=1e-9, atol=1e-9).y
+            for y in y0s
+        ]
+        slow = best_of(loop, repeat=1) if N <= 100 else np.nan
+        fast = best_of(lambda: mivp.solve_fixed(pendulum, (0.0, 10.0), y0s, 1e-2, decimation=5))
+        _, y = mivp.solve_fixed(pendulum, (0.0, 10.0), y0s[:10], 1e-2, decimation=5)
+        reference = np.array(loop() if N == 10 else [])
+        error = np.abs(y.transpose(1, 0, 2) - reference).max() if N == 10 else np.nan
+        print(f"{N:>10} {slow:>14.3f} {fast:>8.3f} {error:>11.1e}")
+    print()
+
+    # Long horizon: 200000 steps, 201 stored samples per trajectory
+    y0s = np.random.default_rng(0).uniform(-2.0, 2.0, (100, 2))
+    print(f"{'method':>7} {'time (s)':>9} {'output (kB)':>12} {'max. energy drift':>18}")
+    for method in ["RK4", "Verlet"]:
+        result = []
+        elapsed = best_of(lambda: result.append(
+            mivp.solve_fixed(pendulum, (0.0, 20000.0), y0s, 0.1, method, decimation=1000)
+        ), repeat=1)
+        _, y = result[-1]
+        drift = np.abs(energy(y) - energy(y[..., :1])).max()
+        print(f"{method:>7} {elapsed:>9.2f} {y.nbytes / 1e3:>12.0f} {drift:>18.2e}")
@@ -0,0 +1,39 @@
+"""
+Cold-start cost of `mivp` in a fresh process (e.g. a worker process)
+"""
+
+# Python Standard Library
+import subprocess
+import sys
+
+# Local Library
+from benchmarks import best_of
+
+CASES = [
+    ("import mivp", "import mivp"),
+    ("solvers", "import mivp; mivp.solve; mivp.solve_alt; mivp.get_data"),
+    ("movies", "import mivp; mivp.generate_movie"),
+    # what `import mivp` used to cost, when the module imported everything
+    ("eager (previous)", "import numpy, scipy.integrate, matplotlib.pyplot"),
+]
+
+
+def run(code):
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def loaded(code):
+    "Heavy libraries loaded by `code`"
+    check = "import sys; print(*[m for m in ('numpy', 'scipy', 'matplotlib') if m in sys.modules])"
+    output = subprocess.run(
+        [sys.executable, "-c", f"{code}; {check}"], check=True, capture_output=True, text=True
+    )
+    return output.stdout.strip() or "-"
+
+
+if __name__ == "__main__":
+    baseline = best_of(lambda: run("pass"), repeat=5)
+    print(f"{'':>17} {'import (s)':>11}  libraries")
+    for label, code in CASES:
+        elapsed = best_of(lambda: run(code), repeat=5) - baseline
+        print(f"{label:>17} {elapsed:>11.3f}  {loaded(code)}")
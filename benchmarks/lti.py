@@ -0,0 +1,38 @@
+"""
+Linear systems: per-sample `expm` loop of the chapters vs `lti.simulate`
+"""
+
+# Third-Party Libraries
+import numpy as np
+from scipy.linalg import expm
+
+# Local Library
+import lti
+from benchmarks import best_of
+
+# Double spring of the stabilization chapter
+A = np.array(
+    [
+        [0.0, 1.0, 0.0, 0.0],
+        [-2.0, 0.0, 1.0, 0.0],
+        [0.0, 0.0, 0.0, 1.0],
+        [1.0, 0.0, -2.0, 0.0],
+    ]
+)
+
+
+def loop(t, y0):  # the chapters code
+    return np.array([expm(A * t_) for t_ in t]) @ y0
+
+
+if __name__ == "__main__":
+    print(f"{'samples':>8} {'states':>7} {'loop (s)':>9} {'expm (s)':>9} {'eig (s)':>9} {'error':>8}")
+    for n, N in [(1000, 1), (10000, 1), (10000, 100)]:
+        t = np.linspace(0.0, 20.0, n)
+        y0 = np.random.default_rng(0).normal(size=(4, N))
+        reference = loop(t, y0)
+        error = np.abs(lti.simulate(A, y0, t) - reference).max()
+        slow = best_of(lambda: loop(t, y0), repeat=1)
+        fast = best_of(lambda: lti.simulate(A, y0, t))
+        eig = best_of(lambda: lti.simulate(A, y0, t, method="eig"))
+        print(f"{n:>8} {N:>7} {slow:>9.3f} {fast:>9.4f} {eig:>9.4f} {error:>8.1e}")
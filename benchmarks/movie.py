@@ -0,0 +1,57 @@
+"""
+mivp.generate_movie: frame rendering and end-to-end (rendering + encoding) throughput
+"""
+
+# Python Standard Library
+import os
+import tempfile
+
+# Third-Party Libraries
+import numpy as np
+import matplotlib as mpl; mpl.use("Agg")
+import matplotlib.pyplot as plt
+
+# Local Library
+import mivp
+from benchmarks import best_of
+
+
+def movie_data(n_frames, n_points=500):
+    theta = np.linspace(0.0, 2 * np.pi, n_points)
+    k = np.arange(n_frames)[:, None]
+    x = (1.0 + 0.01 * k) * np.cos(theta)
+    y = (1.0 - 0.005 * k) * np.sin(theta)
+    return np.stack([x, y], axis=1)  # (n_frames, 2, n_points)
+
+
+def streamplot_axes():
+    fig = plt.figure(figsize=(16, 9))
+    axes = fig.subplots()
+    Y, X = np.mgrid[-2.0:2.0:200j, -2.0:2.0:200j]
+    axes.streamplot(X, Y, -2 * X + Y, -2 * Y + X, color="grey")
+    axes.axis("square")
+    axes.axis("off")
+    return axes
+
+
+def render(data, dpi=300):
+    axes = streamplot_axes()
+    polygon = axes.fill(*data[0], zorder=1000)[0]
+    for _ in mivp.movie._render_frames(axes.get_figure(), axes, polygon, data, dpi):
+        pass
+    plt.close(axes.get_figure())
+
+
+def movie(data, filename):
+    axes = streamplot_axes()
+    mivp.generate_movie(data, filename, fps=60, axes=axes, zorder=1000)
+    plt.close(axes.get_figure())
+
+
+if __name__ == "__main__":
+    n = 120
+    data = movie_data(n)
+    print(f"rendering: {n / best_of(lambda: render(data)):.1f} frames/s")
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "movie.mp4")
+        print(f"end-to-end: {n / best_of(lambda: movie(data, filename), 1):.1f} frames/s")
@@ -0,0 +1,51 @@
+"""
+Observer Monte Carlo: one solve_ivp per sample vs `observers.error_statistics`
+"""
+
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+
+# Local Library
+import observers
+from benchmarks import best_of
+
+# Observer example of the course
+A = np.array([[0.0, 1.0], [0.0, 0.0]])
+C = np.array([[1.0, 0.0]])
+L = observers.observer_gain(A, C, [-1.0, -2.0])
+t = np.linspace(0.0, 5.0, 501)
+
+
+def loop(n_samples):  # the joint X_Xhat system of the course, one sample at a time
+    def fun(t, X_Xhat):
+        x, x_hat = X_Xhat[0:2], X_Xhat[2:4]
+        y, y_hat = C.dot(x), C.dot(x_hat)
+        dx = A.dot(x)
+        dx_hat = A.dot(x_hat) - L.dot(y_hat - y)
+        return np.r_[dx, dx_hat]
+
+    rng = np.random.default_rng(0)
+    errors = []
+    for x0 in rng.standard_normal((n_samples, 2)):
+        result = sci.solve_ivp(fun, (t[0], t[-1]), np.r_[x0, 0.0, 0.0], t_eval=t, max_step=0.1)
+        errors.append(result.y[2:] - result.y[:2])
+    errors = np.array(errors)
+    return errors.mean(axis=0)
+
+
+if __name__ == "__main__":
+    print(f"{'samples':>8} {'loop (s)':>9} {'batch (s)':>10} {'+ noise (s)':>12}")
+    for n in [100, 10000, 100000]:
+        slow = best_of(lambda: loop(n), repeat=1) if n <= 100 else np.nan
+        fast = best_of(lambda: observers.error_statistics(A, C, L, t, np.eye(2), n))
+        noisy = best_of(
+            lambda: observers.error_statistics(
+                A, C, L, t, np.eye(2), n, V=0.1 * np.eye(2), W=0.05 * np.eye(1)
+            ),
+            repeat=1,
+        )
+        print(f"{n:>8} {slow:>9.3f} {fast:>10.3f} {noisy:>12.3f}")
+    _, P = observers.error_statistics(A, C, L, t, np.eye(2), 100000, seed=0)
+    exact = observers.error_covariance(A, C, L, t, np.eye(2))
+    print(f"covariance error (10^5 samples): {np.abs(P - exact).max():.1e}")
@@ -0,0 +1,57 @@
+"""
+Pendulum parameter sweep: `configure` + `solve_ivp` loop vs `pendulum.sweep`
+"""
+
+# Python Standard Library
+import itertools
+import os
+import time
+
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+
+# Local Library
+from examples import pendulum
+
+
+def loop(b, l, u, t):  # one configuration at a time, through the module globals
+    data = []
+    for b_, l_, u_ in itertools.product(b, l, u):
+        pendulum.configure(b=b_, l=l_)
+        pendulum.u = lambda t, u_=u_: u_
+        r = sci.solve_ivp(
+            pendulum.fun, (t[0], t[-1]), [0.0, 0.0], t_eval=t, rtol=1e-6, atol=1e-9
+        )
+        data.append(r.y)
+    return np.array(data).transpose(2, 1, 0)  # (len(t), 2, configurations)
+
+
+def grid(k):
+    return np.linspace(0.1, 1.0, k), np.linspace(0.5, 2.0, k), np.linspace(0.0, 5.0, k)
+
+
+def throughput(function, count):
+    start = time.perf_counter()
+    result = function()
+    return result, count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    t = np.linspace(0.0, 10.0, 201)
+    workers = os.cpu_count()
+    print(f"{'configs':>8} {'loop (traj/s)':>14} {'batch (traj/s)':>15} {f'{workers} workers (traj/s)':>20}")
+    for k in [4, 10, 22]:
+        b, l, u = grid(k)
+        count = k ** 3
+        if count <= 1000:
+            reference, slow = throughput(lambda: loop(b, l, u, t), count)
+        else:
+            reference, slow = None, np.nan
+        data, fast = throughput(lambda: pendulum.sweep(b, l, u, t), count)
+        _, pool = throughput(lambda: pendulum.sweep(b, l, u, t, workers=workers), count)
+        print(f"{count:>8} {slow:>14.0f} {fast:>15.0f} {pool:>20.0f}")
+        if reference is not None:
+            error = np.abs(data.reshape(reference.shape) - reference).max()
+            error /= np.abs(reference).max()
+            print(f"{'':>8} max. relative deviation from solve_ivp: {error:.1e}")
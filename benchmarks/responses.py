@@ -0,0 +1,50 @@
+"""
+IO behavior on 10^5-point grids: pointwise loops vs the `responses` module
+"""
+
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+
+# Local Library
+import responses
+from benchmarks import best_of
+
+rng = np.random.default_rng(0)
+n, m, p = 6, 1, 1
+A = rng.standard_normal((n, n)) - 3.0 * np.eye(n)
+B = rng.standard_normal((n, m))
+C = rng.standard_normal((p, n))
+D = np.zeros((p, m))
+N = 100000
+
+
+def bode_loop(omega):
+    I = np.eye(n)
+    return np.array([C @ np.linalg.solve(1j * w * I - A, B) + D for w in omega])
+
+
+def step_loop(t):
+    r = sci.solve_ivp(lambda t, x: A @ x + B[:, 0], (t[0], t[-1]), np.zeros(n), t_eval=t)
+    return C @ r.y
+
+
+if __name__ == "__main__":
+    omega = np.logspace(-2.0, 3.0, N)
+    t = np.linspace(0.0, 20.0, N)
+    dt = t[1] - t[0]
+    u = np.sign(np.sin(t))
+    h = responses.impulse_response(A, B, C, t)[:, 0, 0]
+
+    timings = [
+        ("bode, loop", lambda: bode_loop(omega)),
+        ("bode, hessenberg", lambda: responses.frequency_response(A, B, C, D, 1j * omega)),
+        ("bode, eig", lambda: responses.frequency_response(A, B, C, D, 1j * omega, method="eig")),
+        ("step, solve_ivp", lambda: step_loop(t)),
+        ("step, exact", lambda: responses.step_response(A, B, C, D, t)),
+        ("convolution, direct", lambda: np.convolve(h, u)[:N] * dt),
+        ("convolution, fft", lambda: responses.convolve(h, u, dt)),
+    ]
+    print(f"{N} points")
+    for label, function in timings:
+        print(f"{label:>20}: {best_of(function, repeat=1):.4f} s")
@@ -0,0 +1,38 @@
+"""
+mivp.solve: per-sample solve_ivp loop vs batched ensemble integration
+"""
+
+# Third-Party Libraries
+import numpy as np
+
+# Local Library
+import mivp
+from benchmarks import best_of
+
+
+def fun(t, xy):
+    x, y = xy
+    dx = -2 * x + y
+    dy = -2 * y + x
+    return np.array([dx, dy])
+
+
+def y0s(n):
+    theta = np.linspace(0.0, 2 * np.pi, n, endpoint=False)
+    return np.c_[2.5 + 2.0 * np.cos(theta), 2.0 * np.sin(theta)]
+
+
+def run(n, batch):
+    t = np.linspace(0.0, 10.0, 601)
+    results = mivp.solve(
+        fun=fun, t_span=(0.0, 10.0), y0s=y0s(n), rtol=1e-6, atol=1e-12, batch=batch
+    )
+    return mivp.get_data(results, t)
+
+
+if __name__ == "__main__":
+    print(f"{'samples':>8} {'loop (s)':>10} {'batch (s)':>10} {'speed-up':>9}")
+    for n in [10, 100, 1000]:
+        loop = best_of(lambda: run(n, batch=False), repeat=1)
+        batch = best_of(lambda: run(n, batch=True))
+        print(f"{n:>8} {loop:>10.3f} {batch:>10.3f} {loop / batch:>9.1f}")
@@ -0,0 +1,63 @@
+"""
+Heat equation on a grid of cells: dense `lti` / Kalman matrix vs `sparse_lti`
+"""
+
+# Third-Party Libraries
+import numpy as np
+
+# Local Library
+import lti
+import sparse_lti
+from benchmarks import best_of
+
+
+def kalman_rank(A, B):
+    "Rank of the Kalman matrix [B, AB, ..., A^(n-1) B] (dense)"
+    n = len(A)
+    K = [B]
+    for _ in range(n - 1):
+        K.append(A @ K[-1])
+    return np.linalg.matrix_rank(np.hstack(K))
+
+
+if __name__ == "__main__":
+    t = np.linspace(0.0, 10.0, 101)
+
+    print("Simulation (heat source in a corner, 101 samples)")
+    print(f"{'states':>8} {'dense (s)':>10} {'sparse (s)':>11} {'max. diff.':>11}")
+    for k in [20, 40, 100, 316]:
+        A, B, C = sparse_lti.heat((k, k))
+        x0, u = np.zeros(A.shape[0]), np.ones((len(t), 1))
+        data = []
+        fast = best_of(lambda: data.append(sparse_lti.simulate(A, x0, t, B, u)), repeat=1)
+        if k <= 40:
+            A_, B_ = A.toarray(), B.toarray()
+            reference = lti.simulate(A_, x0, t, B_, u)
+            slow = best_of(lambda: lti.simulate(A_, x0, t, B_, u), repeat=1)
+            error = np.abs(data[-1] - reference).max()
+        else:
+            slow, error = np.nan, np.nan
+        print(f"{k * k:>8} {slow:>10.3f} {fast:>11.3f} {error:>11.1e}")
+    print()
+
+    print("Controllable subspace dimension (heat source at one end / in a corner)")
+    print(f"{'cells':>8} {'Kalman rank':>12} {'staircase':>10} {'modal':>6} {'time (s)':>9}")
+    for shape in [4, 10, 30, 100, 300, (10, 10), (20, 20), (40, 40)]:
+        A, B, C = sparse_lti.heat(shape)
+        rank = kalman_rank(A.toarray(), B.toarray()) if A.shape[0] <= 100 else "-"
+        basis = sparse_lti.staircase(A, B)[0]
+        result = []
+        elapsed = best_of(lambda: result.append(sparse_lti.controllable_dimension(A, B)), repeat=1)
+        name = "x".join(map(str, np.atleast_1d(shape)))
+        print(f"{name:>8} {rank:>12} {basis.shape[1]:>10} {result[-1]:>6} {elapsed:>9.3f}")
+    print()
+
+    print("Controllability Gramian on [0, 10] (heat source in a corner)")
+    print(f"{'states':>8} {'time (s)':>9} {'rank':>5}  largest eigenvalues")
+    for k in [100, 316]:
+        A, B, C = sparse_lti.heat((k, k))
+        result = []
+        elapsed = best_of(lambda: result.append(sparse_lti.gramian(A, B, 10.0)), repeat=1)
+        Z = result[-1]
+        eigenvalues = " ".join(f"{e:.1e}" for e in np.sum(Z * Z, axis=0)[:4])
+        print(f"{k * k:>8} {elapsed:>9.2f} {Z.shape[1]:>5}  {eigenvalues}")
@@ -0,0 +1,58 @@
+"""
+mivp.solve: dense outputs sampled by `get_data` vs streaming (`stream=True`)
+"""
+
+# Python Standard Library
+import tracemalloc
+
+# Third-Party Libraries
+import numpy as np
+
+# Local Library
+import mivp
+from benchmarks import best_of
+
+
+def fun(t, xy):  # Van der Pol oscillator: many steps per trajectory
+    x, y = xy
+    return np.array([y, (1 - x * x) * y - x])
+
+
+def y0s(n):
+    theta = np.linspace(0.0, 2 * np.pi, n, endpoint=False)
+    return np.c_[3.0 * np.cos(theta), 3.0 * np.sin(theta)]
+
+
+def dense(n, t):
+    results = mivp.solve(fun=fun, t_span=(t[0], t[-1]), y0s=y0s(n), rtol=1e-6, atol=1e-9)
+    return mivp.get_data(results, t)
+
+
+def stream(n, t):
+    return mivp.solve(
+        fun=fun, t_span=(t[0], t[-1]), y0s=y0s(n), t_eval=t, rtol=1e-6, atol=1e-9, stream=True
+    )
+
+
+def peak_memory(function):
+    "Peak memory (in bytes) allocated by `function()`"
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    t = np.linspace(0.0, 50.0, 501)
+    print(f"{'samples':>8} {'output (MB)':>12} {'dense (s)':>10} {'peak (MB)':>10} "
+          f"{'stream (s)':>11} {'peak (MB)':>10} {'max. diff.':>11}")
+    for n in [10, 30, 100]:
+        reference, data = dense(n, t), stream(n, t)
+        error = np.abs(data - reference).max()
+        slow = best_of(lambda: dense(n, t), repeat=1)
+        fast = best_of(lambda: stream(n, t), repeat=1)
+        slow_peak = peak_memory(lambda: dense(n, t))
+        fast_peak = peak_memory(lambda: stream(n, t))
+        print(f"{n:>8} {data.nbytes / 1e6:>12.2f} {slow:>10.2f} {slow_peak / 1e6:>10.1f} "
+              f"{fast:>11.2f} {fast_peak / 1e6:>10.1f} {error:>11.1e}")
@@ -0,0 +1,279 @@
+"""
+Benchmark suite: mivp, the `Q` helper and the build pipeline, with stored results
+
+    python -m benchmarks.suite [--quick] [--match=TEXT]   run (and store) the cases
+    python -m benchmarks.suite history [--match=TEXT]     results of the stored runs
+    python -m benchmarks.suite compare [OLD [NEW]]        compare two stored runs
+
+The results of a run are stored in `.benchmarks/<machine>/<commit>.json`
+(`<commit>-dirty` when the working tree has uncommitted changes), hence the
+runs of successive commits can be compared: `compare` (by default, the two
+most recent runs) flags the results that are `THRESHOLD` times slower and
+exits with status 1 if there are any.
+
+`--quick` runs smaller instances (and the build without code execution);
+`--match=TEXT` only runs the cases whose name contains `TEXT`.
+"""
+
+# Python Standard Library
+import datetime
+import glob
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Third-Party Libraries
+import numpy as np
+import scipy
+
+# Local Library
+import fields
+import mivp
+from benchmarks import best_of, movie
+from benchmarks import fields as chapter_fields
+from benchmarks import solve as solve_benchmark
+
+RESULTS_DIR = ".benchmarks"
+THRESHOLD = 1.2
+
+# Cases: functions of the `quick` flag returning {label: time in seconds}.
+CASES = {}
+
+
+def case(function):
+    CASES[function.__name__] = function
+    return function
+
+
+#
+# Cases
+# ------------------------------------------------------------------------------
+#
+@case
+def solve(quick):
+    "mivp.solve (+ get_data) over growing numbers of initial values"
+    t = np.linspace(0.0, 10.0, 601)
+    options = dict(fun=solve_benchmark.fun, t_span=(0.0, 10.0), rtol=1e-6, atol=1e-12)
+
+    def run(n, mode):
+        y0s = solve_benchmark.y0s(n)
+        if mode == "stream":
+            return mivp.solve(y0s=y0s, t_eval=t, stream=True, **options)
+        return mivp.get_data(mivp.solve(y0s=y0s, batch=mode == "batch", **options), t)
+
+    results = {}
+    for mode in ["loop", "batch", "stream"]:
+        run(1, mode)  # warm-up (lazy imports, caches)
+    for n in [10, 100] if quick else [10, 100, 1000]:
+        for mode in ["loop", "batch", "stream"]:
+            repeat = 3 if mode == "batch" else 1
+            results[f"solve[{mode}, {n}]"] = best_of(lambda: run(n, mode), repeat)
+    return results
+
+
+def gas(t, xy):
+    x, y = xy
+    return np.array([-2 * x + y, -2 * y + x])
+
+
+def attractor(t, xy):
+    x, y = xy
+    r = np.sqrt(x * x + y * y)
+    return np.array([x + x * y - (x + y) * r, y - x * x + (x - y) * r])
+
+
+def vinograd(t, xy):
+    x, y = xy
+    q = x**2 + y**2 * (1 + (x**2 + y**2) ** 2)
+    return np.array([(x**2 * (y - x) + y**5) / q, y**2 * (y - 2 * x) / q])
+
+
+def circle(xc, yc, radius):
+    def boundary(s):
+        theta = 2 * np.pi * np.asarray(s)
+        return np.c_[xc + radius * np.cos(theta), yc + radius * np.sin(theta)]
+    return boundary
+
+
+@case
+def solve_alt(quick):
+    "mivp.solve_alt on the fields of 1-4-Asymptotic-Behavior.md"
+    t = np.r_[np.arange(0.0, 10.0, 1.0 / 60.0), 10.0]
+    problems = [
+        (gas, circle(2.5, 0.0, 2.0)),
+        (attractor, circle(1.0, 0.0, 0.5)),
+        (vinograd, circle(2.5, 0.0, 2.0)),
+    ]
+    results = {}
+    for fun, boundary in problems:
+        run = lambda: mivp.solve_alt(
+            fun=fun, t_eval=t, boundary=boundary, boundary_rtol=0.0,
+            boundary_atol=0.1, rtol=1e-6, atol=1e-12, method="LSODA",
+        )
+        results[f"solve_alt[{fun.__name__}]"] = best_of(run, repeat=1)
+    return results
+
+
+@case
+def generate_movie(quick):
+    "mivp.generate_movie, time per frame (rendering only and end-to-end)"
+    n = 30 if quick else 120
+    data = movie.movie_data(n)
+    results = {"generate_movie[render, per frame]": best_of(lambda: movie.render(data), 1) / n}
+    if shutil.which("ffmpeg"):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "movie.mp4")
+            elapsed = best_of(lambda: movie.movie(data, filename), 1)
+        results["generate_movie[end-to-end, per frame]"] = elapsed / n
+    return results
+
+
+@case
+def Q(quick):
+    "Vector field grids: fields.Q and the chapters helper"
+    n = 300 if quick else 1000
+    xs = ys = np.linspace(-2.0, 2.0, n)
+    f = chapter_fields.lotka_volterra
+    small = np.linspace(-2.0, 2.0, 100)
+    return {
+        f"fields.Q[{n}x{n}]": best_of(lambda: fields.Q(f, xs, ys)),
+        "chapters Q[100x100]": best_of(lambda: chapter_fields.Q(f, small, small), 1),
+    }
+
+
+@case
+def build(quick):
+    "build.py stages for each chapter (code execution with an empty cache)"
+    chapters = sorted(file[:-3] for file in os.listdir() if file[0].isdigit() and file.endswith(".md"))
+    results = {}
+    for chapter in chapters[:1] if quick else chapters:
+        with tempfile.TemporaryDirectory() as cache:
+            env = dict(os.environ, BUILD_CACHE=cache)
+            args = [sys.executable, "build.py"] + (["--fast"] if quick else []) + [f"{chapter}.md"]
+            process = subprocess.run(args, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            errors = re.findall(r"^[\w.]+(?:Error|Exception): .*$", process.stderr, re.MULTILINE)
+            error = errors[-1] if errors else f"exit status {process.returncode}"
+            print(f"  build[{chapter}] skipped: {error}")
+            continue
+        for stage, elapsed in re.findall(rf"^{re.escape(chapter)}\.md: (.+) in ([0-9.]+)s$", process.stdout, re.MULTILINE):
+            results[f"build[{chapter}, {stage}]"] = float(elapsed)
+    return results
+
+
+#
+# Stored Results
+# ------------------------------------------------------------------------------
+#
+def machine():
+    return f"{platform.node()}-{platform.system()}-{platform.machine()}-py{platform.python_version()}"
+
+
+def commit():
+    "Current commit (short hash), with a `-dirty` suffix for uncommitted changes"
+    def git(*args):
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    try:
+        dirty = git("status", "--porcelain", "--untracked-files=no")
+        return git("rev-parse", "--short", "HEAD") + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def store(results):
+    "Merge the results into the file of the current commit; return its path"
+    directory = os.path.join(RESULTS_DIR, machine())
+    os.makedirs(directory, exist_ok=True)
+    filename = os.path.join(directory, commit() + ".json")
+    run = {"results": {}}
+    if os.path.exists(filename):
+        with open(filename) as file:
+            run = json.load(file)
+    run.update(
+        commit=commit(),
+        date=datetime.datetime.now().isoformat(timespec="seconds"),
+        versions={"python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__},
+    )
+    run["results"].update(results)
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, "w") as file:
+        json.dump(run, file, indent=2, sort_keys=True)
+    os.replace(tmp, filename)
+    return filename
+
+
+def runs():
+    "Stored runs of this machine, oldest first"
+    stored = []
+    for filename in glob.glob(os.path.join(RESULTS_DIR, machine(), "*.json")):
+        with open(filename) as file:
+            stored.append(json.load(file))
+    return sorted(stored, key=lambda run: run["date"])
+
+
+def find(stored, prefix):
+    matches = [run for run in stored if run["commit"].startswith(prefix)]
+    if not matches:
+        sys.exit(f"no stored run for commit {prefix!r}")
+    return matches[-1]
+
+
+def history(match="", last=6):
+    stored = runs()[-last:]
+    labels = sorted({label for run in stored for label in run["results"] if match in label})
+    width = max([len(label) for label in labels] + [10])
+    print(f"{'':<{width}} " + " ".join(f"{run['commit'][:13]:>13}" for run in stored))
+    for label in labels:
+        values = [run["results"].get(label) for run in stored]
+        cells = [f"{value:>13.4f}" if value is not None else f"{'-':>13}" for value in values]
+        print(f"{label:<{width}} " + " ".join(cells))
+
+
+def compare(old=None, new=None):
+    "Compare two stored runs (default: the two most recent ones); return the regressions"
+    stored = runs()
+    if len(stored) < 2 and (old is None or new is None):
+        sys.exit("compare needs two stored runs")
+    old = find(stored, old) if old else stored[-2]
+    new = find(stored, new) if new else stored[-1]
+    labels = sorted(set(old["results"]) & set(new["results"]))
+    width = max([len(label) for label in labels] + [10])
+    print(f"{'':<{width}} {old['commit'][:13]:>13} {new['commit'][:13]:>13} {'ratio':>7}")
+    regressions = []
+    for label in labels:
+        a, b = old["results"][label], new["results"][label]
+        ratio = b / a if a > 0 else np.inf
+        flag = "  slower" if ratio > THRESHOLD else "  faster" if ratio < 1 / THRESHOLD else ""
+        print(f"{label:<{width}} {a:>13.4f} {b:>13.4f} {ratio:>7.2f}{flag}")
+        if ratio > THRESHOLD:
+            regressions.append(label)
+    return regressions
+
+
+if __name__ == "__main__":
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    match = ""
+    for option in options:
+        if option.startswith("--match="):
+            match = option.split("=", 1)[1]
+
+    if args[:1] == ["history"]:
+        history(match)
+    elif args[:1] == ["compare"]:
+        sys.exit(1 if compare(*args[1:3]) else 0)
+    else:
+        quick = "--quick" in options
+        results = {}
+        for name, function in CASES.items():
+            if match in name:
+                print(f"{name}: {function.__doc__}")
+                for label, elapsed in function(quick).items():
+                    print(f"  {label:<40} {elapsed:>10.4f} s")
+                    results[label] = elapsed
+        print(f"Results stored in {store(results)}")
@@ -0,0 +1,66 @@
+"""
+Gain sweeps: one design at a time (place_poles + solve_ivp) vs `sweep.place`
+"""
+
+# Python Standard Library
+import os
+
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+import scipy.signal as sig
+
+# Local Library
+import sweep
+from benchmarks import best_of
+
+# Double spring of the stabilization chapter
+A = np.array(
+    [
+        [0.0, 1.0, 0.0, 0.0],
+        [-2.0, 0.0, 1.0, 0.0],
+        [0.0, 0.0, 0.0, 1.0],
+        [1.0, 0.0, -2.0, 0.0],
+    ]
+)
+B = np.array([[0.0], [1.0], [0.0], [0.0]])
+
+
+def pole_sets(k):
+    "k pole sets, half of them repeated (as in a sweep over a coarse grid)"
+    rng = np.random.default_rng(0)
+    poles = -rng.uniform(1.0, 5.0, (k // 2, 4))
+    return np.concatenate([poles, poles])
+
+
+def loop(poles):  # design then simulate each closed loop
+    costs = []
+    for p in poles:
+        K = sig.place_poles(A, B, p).gain_matrix
+        A_cl = A - B @ K
+
+        def fun(t, x_c):
+            x = x_c[:-1]
+            u = -K @ x
+            return np.r_[A_cl @ x, x @ x + u @ u]
+
+        cost = 0.0
+        for x0 in np.eye(4):  # average cost over the unit initial states
+            r = sci.solve_ivp(fun, (0.0, 50.0), np.r_[x0, 0.0], rtol=1e-8, atol=1e-10)
+            cost += r.y[-1, -1]
+        costs.append(cost)
+    return np.array(costs)
+
+
+if __name__ == "__main__":
+    workers = os.cpu_count()
+    print(f"{'designs':>8} {'loop (s)':>9} {'sweep (s)':>10} {f'{workers} workers (s)':>14}")
+    for k in [100, 1000, 10000]:
+        poles = pole_sets(k)
+        slow = best_of(lambda: loop(poles), repeat=1) if k <= 100 else np.nan
+        fast = best_of(lambda: sweep.place(A, B, poles), repeat=1)
+        pool = best_of(lambda: sweep.place(A, B, poles, workers=workers), repeat=1)
+        print(f"{k:>8} {slow:>9.3f} {fast:>10.3f} {pool:>14.3f}")
+    poles = pole_sets(100)
+    error = np.abs(loop(poles) / sweep.place(A, B, poles)["cost"] - 1.0).max()
+    print(f"cost relative error: {error:.1e}")
@@ -3,11 +3,20 @@
 Build notebooks & slides for a single markdown documents
 """
 # Python 3 Standard Library
+import ast
+import contextlib
 import copy
+import hashlib
+import importlib.util
+import inspect
 import io
 import json
 import os.path
+import re
+import shutil
 import sys
+import time
+import uuid
 
 # Third-Party
 import lxml.etree
@@ -15,17 +24,23 @@ import lxml.etree
 # Pandoc
 import pandoc
 from pandoc.types import (
+    Code,
     CodeBlock,
     Div,
     Format,
     Header,
     HorizontalRule,
     Image,
+    LineBreak,
     Link,
+    Pandoc,
     Para,
     Plain,
     RawBlock,
     RawInline,
+    SoftBreak,
+    Space,
+    Str,
     Strong,
 )
 
@@ -59,7 +74,17 @@ flags:
 # ------------------------------------------------------------------------------
 doc_file = sys.argv[-1]  # some markdown document
 doc_name = os.path.splitext(doc_file)[0]
-doc = pandoc.read(file=doc_file)
+
+
+@contextlib.contextmanager
+def timed(label):
+    start = time.perf_counter()
+    yield
+    print(f"{doc_file}: {label} in {time.perf_counter() - start:.2f}s")
+
+
+with timed("read"):
+    doc = pandoc.read(file=doc_file)
 
 # Code Execution
 # ------------------------------------------------------------------------------
@@ -72,69 +97,476 @@ doc = pandoc.read(file=doc_file)
 
 # TODO: need to perform the same transformation into the document used
 #       for the notebook backend.
-def exec_code(doc):
+def code_cells(doc):
     """
-    Execute all code blocks not flagged as "notebook" (and not in "notebook" div).
+    Return the source of code blocks not flagged as "notebook" (and not in
+    "notebook" div), in document order.
     """
-    doc = copy.deepcopy(doc)
-    toplevel_blocks = doc[1]  # top-level blocks (Pandoc(Meta, [Block]))
-
-    # Locate the divs and extract the relevant data
-    divs = []
-    for index, elt in enumerate(toplevel_blocks):  # top-level divs only
-        if isinstance(elt, Div):
-            div = elt
-            attr, blocks = div[:]  # Div(Attr, [Block])
+    cells = []
+    for block in doc[1]:  # top-level blocks (Pandoc(Meta, [Block]))
+        if isinstance(block, Div):
+            attr, blocks = block[:]  # Div(Attr, [Block])
             classes = attr[1]  # Attr = (Text, [Text], [(Text, Text)])
+            if "notebook" in classes:  # top-level divs only
+                continue
+        for elt in pandoc.iter(block):
+            if isinstance(elt, CodeBlock):
+                code = elt
+                attr, text = code[:]  # CodeBlock(Attr, Text)
+                _, classes, _ = attr[:]  # Attr = (Text, [Text], [(Text, Text)])
+                if "notebook" not in classes and "no-exec" not in classes:
+                    cells.append(text + "\n")
+    return cells
+
+
+# Code Execution Cache
+# ------------------------------------------------------------------------------
+# Cells are identified by a hash of their source, of the sources of the
+# local modules they import and of the hashes of the cells they depend on.
+# The files that a cell writes in OUTPUT_DIRS are stored (content-addressed)
+# in CACHE_DIR; on a rebuild, the outputs of the unchanged cells are
+# restored and only the changed cells (and the cells they depend on) are
+# executed.
+#
+# Dependencies are approximated from the names that appear in the cells:
+# a cell depends on
+#   - every previous cell with an import statement,
+#   - for every name it mentions, the last previous cell that binds or
+#     mutates it (assignment, definition, attribute or item assignment,
+#     method call, also through attributes such as `np.random.seed(0)`);
+#     the names read by the functions (and classes) that it uses count as
+#     mentioned,
+#   - the last previous cell using matplotlib's implicit state (the names
+#     that the cells import from pyplot), if it uses it too and doesn't
+#     start with a new figure.
+#
+# The files written by a cell are recorded as they are opened (see
+# `record_writes`), not guessed from the modification times, since other
+# builds may write in OUTPUT_DIRS at the same time.
+
+CACHE_DIR = os.environ.get("BUILD_CACHE", ".build-cache")
+OUTPUT_DIRS = ["images", "videos"]
+ROOT = os.path.dirname(os.path.realpath(__file__))
+
+PYPLOT_ALIASES = {"plt", "pp", "mpl", "save", "set_ratio"}
+PYPLOT_MODULES = {"matplotlib.pyplot", "pylab"}
+NEW_FIGURE = {"figure", "subplots"}
+
+
+def pyplot_bindings(tree, star_names):
+    "Names bound to pyplot (or its functions) by the imports of a cell"
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name in PYPLOT_MODULES:
+                    names.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ImportFrom) and node.module in PYPLOT_MODULES:
+            for alias in node.names:
+                if alias.name == "*":
+                    names |= star_names
+                else:
+                    names.add(alias.asname or alias.name)
+    return names
+
+
+def cell_info(src, pyplot_names, star_names):
+    """
+    Names mentioned & modified, (top-level) imported modules, names read by
+    the defined functions & classes, pyplot state use & new figure flags,
+    names bound to pyplot after the cell
+    """
+    tree = ast.parse(src)
+    bound = pyplot_bindings(tree, star_names)
+    pyplot_names = pyplot_names | bound
+    mentioned, modified = set(), set()
+    modules, reads = set(), {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            mentioned.add(node.id)
+            if not isinstance(node.ctx, ast.Load):
+                modified.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            modified.add(node.name)
+            reads[node.name] = {
+                n.id for n in ast.walk(node)
+                if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)
+            }
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                modules.add(alias.name.split(".")[0])
+                modified.add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, ast.ImportFrom):
+            modules.add((node.module or "").split(".")[0])  # no relative imports in cells
+            for alias in node.names:
+                modified.add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, (ast.Attribute, ast.Subscript)):
+            base = node.value
+            while isinstance(base, (ast.Attribute, ast.Subscript)):
+                base = base.value
+            if isinstance(base, ast.Name) and base.id not in pyplot_names:
+                if not isinstance(node.ctx, ast.Load):  # x.a = ..., x[i] = ...
+                    modified.add(base.id)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            base = node.func.value  # x.append(...), ax.plot(...), np.random.seed(...)
+            while isinstance(base, (ast.Attribute, ast.Subscript)):
+                base = base.value
+            if isinstance(base, ast.Name) and base.id not in pyplot_names:
+                modified.add(base.id)
+    mentioned |= modified
+    pyplot = bool(mentioned & pyplot_names)
+    new_figure = False
+    for statement in tree.body:
+        statement_names = {n.id for n in ast.walk(statement) if isinstance(n, ast.Name)}
+        if statement_names & pyplot_names:
+            value = getattr(statement, "value", None)
+            if isinstance(value, ast.Call):
+                func = value.func
+                name = getattr(func, "id", None) or getattr(func, "attr", None)
+                new_figure = name in NEW_FIGURE
+            break
+    pyplot_names = pyplot_names - (modified - bound)  # rebound names
+    return mentioned, modified, modules, reads, pyplot, new_figure, pyplot_names
+
+
+def cell_dependencies(cells):
+    """
+    Direct dependencies of each cell (sets of indices of previous cells)
+    and modules that it imports
+    """
+    import matplotlib.pyplot
+
+    # Names bound by `from matplotlib.pyplot import *`, except modules (np, cm)
+    star_names = {
+        name for name, value in vars(matplotlib.pyplot).items()
+        if not name.startswith("_") and not inspect.ismodule(value)
+    }
+    pyplot_names = set(PYPLOT_ALIASES)
+    dependencies, imports = [], []
+    last_modified = {}
+    function_reads = {}  # names read by the functions & classes defined so far
+    import_cells = []
+    last_pyplot = None
+    for index, src in enumerate(cells):
+        mentioned, modified, modules, reads, pyplot, new_figure, pyplot_names = cell_info(
+            src, pyplot_names, star_names
+        )
+        names, stack = set(), list(mentioned)
+        while stack:  # a call to f reads the globals that f reads
+            name = stack.pop()
+            if name not in names:
+                names.add(name)
+                stack.extend(function_reads.get(name, ()))
+        deps = set(import_cells)
+        deps.update(last_modified[name] for name in names if name in last_modified)
+        if pyplot and not new_figure and last_pyplot is not None:
+            deps.add(last_pyplot)
+        dependencies.append(deps)
+        imports.append(modules)
+        for name in modified:
+            last_modified[name] = index
+            function_reads.pop(name, None)
+        function_reads.update(reads)
+        if modules:
+            import_cells.append(index)
+        if pyplot:
+            last_pyplot = index
+    return dependencies, imports
+
+
+_local_files = {}
+
+
+def local_files(module):
+    """
+    Source files of `module` if it is a local module or package (in the
+    project directory, but not in an environment) and of the local modules
+    that they import
+    """
+    if module in _local_files:
+        return _local_files[module]
+    _local_files[module] = files = set()  # (import cycles)
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return files
+    if spec is None or not spec.has_location or not spec.origin:
+        return files
+    path = os.path.relpath(os.path.realpath(spec.origin), ROOT)
+    parts = path.split(os.sep)
+    if parts[0] == ".." or parts[0].startswith(".") or "site-packages" in parts:
+        return files
+    if spec.submodule_search_locations:  # package: all its modules
+        for root, _, filenames in os.walk(os.path.dirname(spec.origin)):
+            files.update(os.path.join(root, f) for f in filenames if f.endswith(".py"))
+    else:
+        files.add(spec.origin)
+    for file in list(files):
+        with open(file, encoding="utf-8") as source:
+            tree = ast.parse(source.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                files |= local_files(name.split(".")[0])
+    return files
+
+
+def cell_keys(cells, dependencies, imports):
+    keys = []
+    for src, deps, modules in zip(cells, dependencies, imports):
+        hash = hashlib.sha256(src.encode("utf-8"))
+        for index in sorted(deps):
+            hash.update(keys[index].encode("ascii"))
+        files = set().union(*(local_files(module) for module in modules))
+        for path in sorted(files):
+            hash.update(os.path.relpath(path, ROOT).encode("utf-8"))
+            hash.update(file_hash(path).encode("ascii"))
+        keys.append(hash.hexdigest())
+    return keys
+
+
+# Files opened for writing, renamed to or passed to a subprocess (such as
+# ffmpeg outputs) during `record_writes`. Files written by other processes
+# are only known when they appear in their command line.
+_written = None
+
+
+def audit(event, args):
+    if _written is None:
+        return
+    if event == "open":
+        path, _, flags = args
+        if not isinstance(path, int) and flags & (os.O_WRONLY | os.O_RDWR):
+            _written.append(path)
+    elif event == "os.rename":  # also os.replace
+        _written.append(args[1])
+    elif event == "subprocess.Popen":
+        command = args[1]
+        _written.extend([command] if isinstance(command, (str, bytes)) else command)
+
+
+sys.addaudithook(audit)
+
+
+def output_path(path):
+    "Path of a file in OUTPUT_DIRS (relative to the current directory), or None"
+    try:
+        path = os.path.relpath(os.fsdecode(path))
+    except (TypeError, ValueError):
+        return None
+    if path.split(os.sep)[0] in OUTPUT_DIRS and os.path.isfile(path):
+        return path
+
+
+@contextlib.contextmanager
+def record_writes():
+    "Yield a set, filled on exit with the paths of the output files written"
+    global _written
+    _written, outputs = [], set()
+    try:
+        yield outputs
+    finally:
+        written, _written = _written, None
+    outputs.update(filter(None, map(output_path, written)))
+
+
+def file_hash(path):
+    hash = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            hash.update(chunk)
+    return hash.hexdigest()
+
+
+def atomic_copy(src, dst):
+    # Concurrent builds share the cache: never expose partial files.
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def store_outputs(key, paths):
+    blobs = os.path.join(CACHE_DIR, "blobs")
+    os.makedirs(blobs, exist_ok=True)
+    outputs = {}
+    for path in sorted(paths):
+        sha = file_hash(path)
+        blob = os.path.join(blobs, sha)
+        if not os.path.exists(blob):
+            atomic_copy(path, blob)
+        outputs[path] = sha
+    manifest = os.path.join(CACHE_DIR, "cells", key + ".json")
+    os.makedirs(os.path.dirname(manifest), exist_ok=True)
+    tmp = f"{manifest}.{os.getpid()}.tmp"
+    with open(tmp, "w") as file:
+        json.dump({"outputs": outputs}, file, indent=2)
+    os.replace(tmp, manifest)
+
+
+def load_outputs(key):
+    "Outputs of the cell in the cache, or None (cache miss)"
+    manifest = os.path.join(CACHE_DIR, "cells", key + ".json")
+    try:
+        with open(manifest) as file:
+            outputs = json.load(file)["outputs"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+    # Blobs may be missing in a pruned (or partially deleted) cache.
+    for sha in outputs.values():
+        if not os.path.exists(os.path.join(CACHE_DIR, "blobs", sha)):
+            return None
+    return outputs
+
+
+def restore_outputs(outputs):
+    for path, sha in outputs.items():
+        if os.path.exists(path) and file_hash(path) == sha:
+            continue
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        atomic_copy(os.path.join(CACHE_DIR, "blobs", sha), path)
 
-            if "notebook" in classes:
-                divs.append((index, blocks))
-
-    # Reverse document order is needed not to invalidate
-    # the remaining matches indices.
-    for index, blocks in reversed(divs):
-        del toplevel_blocks[index]  # remove the div
-
-    src = ""
-    for elt in pandoc.iter(doc):
-        if isinstance(elt, CodeBlock):
-            code = elt
-            attr, text = code[:]  # CodeBlock(Attr, Text)
-            _, classes, _ = attr[:]  # Attr = (Text, [Text], [(Text, Text)])
-            if "notebook" not in classes and "no-exec" not in classes:
-                src += text + "\n"
+
+def exec_code(doc):
+    """
+    Execute all code blocks not flagged as "notebook" (and not in "notebook" div),
+    unless their outputs are available in the cache.
+    """
+    cells = code_cells(doc)
     with open(".tmp.py", "w") as output:
-        output.write(src)
-    exec(src, {"__file__": __file__})
+        output.write("".join(cells))
+
+    dependencies, imports = cell_dependencies(cells)
+    keys = cell_keys(cells, dependencies, imports)
+    cached = [load_outputs(key) for key in keys]
+
+    # Changed cells and (transitively) the cells they depend on.
+    needed = set()
+    stack = [index for index, outputs in enumerate(cached) if outputs is None]
+    while stack:
+        index = stack.pop()
+        if index not in needed:
+            needed.add(index)
+            stack.extend(dependencies[index])
+
+    namespace = {"__file__": __file__}
+    for index, (src, key) in enumerate(zip(cells, keys)):
+        if index in needed:
+            with record_writes() as outputs:
+                exec(compile(src, f"{doc_file} (cell {index})", "exec"), namespace)
+            store_outputs(key, outputs)
+        else:
+            restore_outputs(cached[index])
+    print(f"{doc_file}: {len(needed)}/{len(cells)} code cells executed")
 
 
 if "--fast" not in sys.argv:
-    exec_code(doc)
+    with timed("code execution"):
+        exec_code(doc)
 
-# Document Filter
+# Document Transforms
 # ------------------------------------------------------------------------------
-# TODO: great stuff, why not used yet ?!? Ah I see because the concrete
-# operations not only remove but unpack stuff or delete. So we need a
-# replace rather than a remove.
-def remove(doc, needs_removal):
-    "Selected Content Removal - Two-pass Algorithm"
+# Each output target has a registry of rules, applied to the document in a
+# single top-down traversal. A rule `function(elt, parents, state)` is
+# called on the elements of the given type; it returns a replacement, a
+# `Splice` of blocks to insert in the parent list instead of the element,
+# or None to keep the element. `parents` are the ancestors of the element
+# and `state` a dict shared by the rules of a traversal.
+#
+# Rules never modify elements in place; the traversal rebuilds only the
+# elements whose content has changed and shares the other subtrees with
+# the source document (and thus between targets).
+
+RULES = {"slides": [], "notebook": []}
+
+
+def rule(target, type_):
+    "Register a rule that applies to the elements of type `type_`"
+
+    def register(function):
+        RULES[target].append((type_, function))
+        return function
+
+    return register
+
+
+class Splice(list):
+    "Blocks that replace an element of a list"
+
+
+def transform(elt, rules, parents=(), state=None, skip=None):
+    "Apply the rules to `elt` and its descendants (see RULES)"
+    if state is None:
+        state = {}
+    for type_, function in rules:
+        if function is not skip and isinstance(elt, type_):
+            new_elt = function(elt, parents, state)
+            if isinstance(new_elt, Splice):
+                # The blocks are transformed in place of elt, but not by the
+                # rule that produced them.
+                return Splice(
+                    transform(e, rules, parents, state, skip=function)
+                    for e in new_elt
+                )
+            elif new_elt is not None:
+                elt = new_elt
+
+    if isinstance(elt, str) or not hasattr(elt, "__iter__"):
+        return elt
+    parents = parents + (elt,)
+    if isinstance(elt, dict):
+        children = list(elt.items())
+    else:
+        children = elt[:]
+    new_children = []
+    changed = False
+    for child in children:
+        new_child = transform(child, rules, parents, state)
+        changed = changed or new_child is not child
+        if isinstance(new_child, Splice):
+            new_children.extend(new_child)
+        else:
+            new_children.append(new_child)
+    if not changed:
+        return elt
+    elif isinstance(elt, pandoc.types.Type):
+        return type(elt)(*new_children)
+    elif isinstance(elt, dict):
+        return dict(new_children)
+    else:
+        return type(elt)(new_children)  # list or tuple
+
+
+def is_toplevel(parents):
+    "Is the element a top-level block (Pandoc(Meta, [Block]))?"
+    return len(parents) == 2 and isinstance(parents[0], Pandoc)
+
+
+def text(inlines):
+    "The text of a list of inlines (without any markup)"
+    parts = []
+    for elt in pandoc.iter(inlines):
+        if isinstance(elt, Str):
+            parts.append(elt[0])
+        elif isinstance(elt, (Space, SoftBreak, LineBreak)):
+            parts.append(" ")
+        elif isinstance(elt, Code):
+            parts.append(elt[1])
+    return "".join(parts)
 
-    doc = copy.deepcopy(doc)  # the removal is actually in-place,
-    # but the user of this function should not worry about that.
 
-    # Locate the divs and extract the relevant data
-    matches = []
-    for elt, path in pandoc.iter(doc, path=True):
-        if needs_removal(elt):
-            parent, index = path[-1]
-            matches.append((parent, index))
+def remove(doc, needs_removal):
+    "Selected Content Removal"
 
-    # Reverse document order is needed not to invalidate
-    # the remaining matches indices.
-    for parent, index in reversed(matches):
-        del parent[index]
+    def removal(elt, parents, state):
+        if needs_removal(elt):
+            return Splice()
 
-    return doc
+    return transform(doc, [(object, removal)])
 
 
 # Slides Generation
@@ -151,33 +583,15 @@ def remove(doc, needs_removal):
 # and / or no newpage). Can we solve this by unpacking slides divs ?
 
 
-def make_slides_doc(doc):
-    doc = copy.deepcopy(doc)  # the transformation is actually in-place,
-    # but the user of this function should not worry about that.
-
-    root = doc[1]  # top-level blocks
-
-    # Locate the divs and extract the relevant data
-    divs = []
-    for index, elt in enumerate(root):  # top-level divs only
-        if isinstance(elt, Div):
-            div = elt
-            attr, blocks = div[:]  # Div(Attr, [Block])
-            classes = attr[1]  # Attr = (Text, [Text], [(Text, Text)])
-
-            if "hidden" in classes or "notebook" in classes:
-                divs.append(("remove", index, blocks))
-            elif "notes" not in classes:  # don't remove the speaker notes wrapper.
-                divs.append(("unpack", index, blocks))
-
-    # Reverse document order is needed not to invalidate
-    # the remaining matches indices.
-    for action, index, blocks in reversed(divs):
-        del root[index]
-        if action == "unpack":
-            root[index:index] = blocks
-
-    return doc
+@rule("slides", Div)
+def make_slides_doc(div, parents, state):
+    if is_toplevel(parents):  # top-level divs only
+        attr, blocks = div[:]  # Div(Attr, [Block])
+        classes = attr[1]  # Attr = (Text, [Text], [(Text, Text)])
+        if "hidden" in classes or "notebook" in classes:
+            return Splice()
+        elif "notes" not in classes:  # don't remove the speaker notes wrapper.
+            return Splice(blocks)
 
 
 COLOR_THEME = {
@@ -196,40 +610,31 @@ COLOR_THEME = {
 }
 
 
-def colorize(doc):
-    doc = copy.deepcopy(doc)
-
-    # Replace rules with empty level 2 headers
-    rules = []
-    for elt, path in pandoc.iter(doc, path=True):
-        if isinstance(elt, HorizontalRule):
-            holder, index = path[-1]
-            rules.append((elt, holder, index))
-    for _, holder, index in reversed(rules):
-        empty_header = Header(2, ("", [], []), [])
-        holder[index] = empty_header
+# Replace rules with empty level 2 headers
+@rule("slides", HorizontalRule)
+def horizontal_rule(rule, parents, state):
+    return Header(2, ("", [], []), [])
 
-    # Colors
-    color = None
-    for block in doc[1]:
-        if isinstance(block, Header):
-            header = block
-            lvl, attr, inlines = header[:]
-            if lvl == 2:
-                id_, classes, kvs = attr
-                title = pandoc.write(inlines)
-                for emoji in COLOR_THEME:
-                    if emoji in title:
-                        color = f"{COLOR_THEME[emoji]}"
-                        break
-                if color is not None:
-                    kvs.append(("data-background-color", color))
 
-    return doc
+@rule("slides", Header)
+def colorize(header, parents, state):
+    if is_toplevel(parents):
+        lvl, attr, inlines = header[:]
+        if lvl == 2:
+            id_, classes, kvs = attr
+            title = text(inlines)
+            for emoji in COLOR_THEME:
+                if emoji in title:
+                    state["color"] = f"{COLOR_THEME[emoji]}"
+                    break
+            color = state.get("color")
+            if color is not None:
+                kvs = kvs + [("data-background-color", color)]
+                return Header(lvl, (id_, classes, kvs), inlines)
 
 
-slides_doc = make_slides_doc(doc)
-slides_doc = colorize(slides_doc)
+with timed("slides transform"):
+    slides_doc = transform(doc, RULES["slides"])
 
 
 options = [
@@ -243,7 +648,8 @@ options = [
     "history:true",
 ]
 
-pandoc.write(slides_doc, file=doc_name + ".html", format="revealjs", options=options)
+with timed("slides output"):
+    pandoc.write(slides_doc, file=doc_name + ".html", format="revealjs", options=options)
 
 # 🪲🪛 Fix Pandoc+reveal+unpkg bug
 with open(doc_name + ".html", mode="tr") as f:
@@ -259,36 +665,16 @@ with open(doc_name + ".html", mode="tw") as f:
 
 # Notebook Generation
 # ------------------------------------------------------------------------------
-def make_notebook_doc(doc):
-    doc = copy.deepcopy(doc)  # the transformation is actually in-place,
-    # but the user of this function should not worry about that.
-
-    root = doc[1]  # top-level blocks
-
-    # Locate the divs and extract the relevant data
-    divs = []
-    for index, elt in enumerate(root):
-        if isinstance(elt, Div):
-            div = elt
-            classes = div[0][1]
-            blocks = div[1]
-
-            if "hidden" in classes or "slides" in classes or "notes" in classes:
-                divs.append(("remove", index, blocks))
-            else:
-                divs.append(("unpack", index, blocks))
-
-    # Reverse document order is needed not to invalidate
-    # the remaining matches indices.
-    for action, index, blocks in reversed(divs):
-        del root[index]
-        if action == "unpack":
-            root[index:index] = blocks
-
-    return doc
-
+@rule("notebook", Div)
+def make_notebook_doc(div, parents, state):
+    if is_toplevel(parents):
+        classes = div[0][1]
+        blocks = div[1]
+        if "hidden" in classes or "slides" in classes or "notes" in classes:
+            return Splice()
+        else:
+            return Splice(blocks)
 
-notebook_doc = make_notebook_doc(doc)
 
 VIDEO_TEMPLATE = '''
 from IPython.display import HTML
@@ -300,93 +686,82 @@ HTML("""
 '''
 
 
-video_elements = []
-for elt, path in pandoc.iter(notebook_doc, path=True):
-    if isinstance(elt, RawBlock):
-        format, content = elt[:]
-        if format == Format("html"):
-            parser = lxml.etree.HTMLParser()
-            tree = lxml.etree.parse(io.StringIO(content), parser)
-            html = tree.getroot()
-            if html is not None and len(html):
-                videos = list(html.iter("video"))
-                if videos:
-                    video = videos[0]
-                    source = video.find("source")
-                    src = source.attrib["src"]
-                    type_ = source.attrib["type"]
-                    code = CodeBlock(
-                        ("", [], []), VIDEO_TEMPLATE.format(src=src, type=type_)
-                    )
-                    holder, index = path[-1]
-                    video_elements.append((holder, index, code))
-
-for holder, index, code in reversed(video_elements):
-    holder[index] = code
-
-# TODO: search for raw html, parse with lxml, filter on video tags, search for
-# source(s? first one?), generate the appropriate Jupyter Code Cell.
-
-data_background_headers = []
-for elt, path in pandoc.iter(notebook_doc, path=True):
-    if isinstance(elt, Header):
-        header = elt
-        _, attr, _ = header[:]
-        _, cls, kvs = attr
-        if "display" in cls:
-            holder = path[-1]
-            url = None
-            for k, v in kvs:
-                if k == "data-background":
-                    url = v
-                    break
-            data_background_headers.append((header, holder, url))
+@rule("notebook", RawBlock)
+def video(elt, parents, state):
+    format, content = elt[:]
+    if format == Format("html"):
+        parser = lxml.etree.HTMLParser()
+        tree = lxml.etree.parse(io.StringIO(content), parser)
+        html = tree.getroot()
+        if html is not None and len(html):
+            videos = list(html.iter("video"))
+            if videos:
+                video = videos[0]
+                source = video.find("source")
+                src = source.attrib["src"]
+                type_ = source.attrib["type"]
+                return CodeBlock(
+                    ("", [], []), VIDEO_TEMPLATE.format(src=src, type=type_)
+                )
+
+
+@rule("notebook", Header)
+def data_background_header(header, parents, state):
+    _, attr, _ = header[:]
+    _, cls, kvs = attr
+    if "display" in cls:
+        url = None
+        for k, v in kvs:
+            if k == "data-background":
+                url = v
+                break
+        attr = ("", [], [])
+        inlines = []
+        title = ""
+        image = Image(attr, inlines, (url, title))
+        return Para([image])
 
-for header, holder, url in reversed(data_background_headers):
-    parent, index = holder
-    attr = ("", [], [])
-    inlines = []
-    title = ""
-    image = Image(attr, inlines, (url, title))
-    parent[index] = Para([image])
 
 # Youtube videos (iframes) support in notebooks
-found = []
-for elt, path in pandoc.iter(notebook_doc, path=True):
-    if isinstance(elt, RawBlock):
-        format, src = elt[:]
-        if format == Format("html"):
-            src = src.strip()
-            if src.startswith("<iframe "):
-                found.append((elt, path))
-
-for elt, path in reversed(found):
-    parent, index = path[-1]
-    src = elt[1]
-    attr = ("", [], [("lang", "python")])
-    codeblock = CodeBlock(attr, f"from IPython.display import HTML\n\nHTML('{src}')\n")
-    parent[index] = codeblock
+@rule("notebook", RawBlock)
+def iframe(elt, parents, state):
+    format, src = elt[:]
+    if format == Format("html"):
+        src = src.strip()
+        if src.startswith("<iframe "):
+            src = elt[1]
+            attr = ("", [], [("lang", "python")])
+            return CodeBlock(attr, f"from IPython.display import HTML\n\nHTML('{src}')\n")
+
 
 # Remove constructs unsupported by notebooks from Jupyter Markdown Cells.
 # ATM attributes removal in Headers and Images and removes (unwraps)
 # internal links.
-for elt in pandoc.iter(notebook_doc):
-    empty_attr = ("", [], [])
-    if isinstance(elt, Header):
-        elt[1] = empty_attr
-    elif isinstance(elt, Image):
-        elt[0] = empty_attr
-found = []
-for elt, path in pandoc.iter(notebook_doc, path=True):
-    if isinstance(elt, Link):
-        link = elt
-        url, title = target = link[2]
-        if url.startswith("#"):  # local
-            found.append((link, path))
-for link, path in reversed(found):
-    parent, index = path[-1]
-    inlines = link[1]
-    parent[index] = Strong(inlines)
+EMPTY_ATTR = ("", [], [])
+
+
+@rule("notebook", Header)
+def header_attributes(header, parents, state):
+    if header[1] != EMPTY_ATTR:
+        return Header(header[0], EMPTY_ATTR, header[2])
+
+
+@rule("notebook", Image)
+def image_attributes(image, parents, state):
+    if image[0] != EMPTY_ATTR:
+        return Image(EMPTY_ATTR, image[1], image[2])
+
+
+@rule("notebook", Link)
+def local_link(link, parents, state):
+    url, title = target = link[2]
+    if url.startswith("#"):  # local
+        inlines = link[1]
+        return Strong(inlines)
+
+
+with timed("notebook transform"):
+    notebook_doc = transform(doc, RULES["notebook"])
 
 
 def Notebook():
@@ -431,6 +806,82 @@ def MarkdownCell():
     return copy.deepcopy({"cell_type": "markdown", "metadata": {}, "source": []})
 
 
+MARKDOWN_OPTIONS = ["-t", "markdown-smart-raw_attribute-simple_tables"]
+# markdown-smart-raw_attribute variant
+# ------------------------------------------------------------------------------
+# -smart needed for en-dashes for example: we don't expect Jupyter
+# cells to be smart, so we *disable* the smart output so that
+# '–' won't get represented as '--'. Doesn't work in metadata (?)
+# -raw_attribute so that raw html is output as HTML, not as
+# the non-standard markdown syntax `<p>Hello</p>`{=html} that
+# the Jupyter notebooks do not understand.
+# ------------------------------------------------------------------------------
+# UPDATE: replace this markdown variant by github-flavored
+# markdown (for example to get a proper rendering of tables
+# in notebooks). Arf, no, would fuck up the math. Need to
+# find selectively what kind of tables are allowed.
+# UPDATE: ok, the removal of simple_tables works.
+
+
+def markdown_sources(blocks):
+    """
+    Markdown source of each block, as if written separately with pandoc.
+
+    Blocks already converted by a previous build are taken from the cache;
+    the other ones are converted with a single pandoc call, separated by
+    sentinel paragraphs. Blocks with footnotes (gathered at the end of
+    the document by pandoc) are written separately.
+    """
+    from pandoc.types import Pandoc, Meta, Note, Para, Str
+
+    cache_file = os.path.join(CACHE_DIR, "markdown", doc_name + ".json")
+    try:
+        with open(cache_file) as file:
+            cache = json.load(file)
+    except FileNotFoundError:
+        cache = {}
+
+    keys = []
+    for block in blocks:
+        hash = hashlib.sha256(repr(MARKDOWN_OPTIONS).encode("utf-8"))
+        hash.update(repr(block).encode("utf-8"))
+        keys.append(hash.hexdigest())
+
+    batch = {}  # key -> block, in document order
+    for key, block in zip(keys, blocks):
+        if key not in cache:
+            if any(isinstance(elt, Note) for elt in pandoc.iter(block)):
+                wrapper = Pandoc(Meta({}), [block])
+                cache[key] = pandoc.write(wrapper, options=MARKDOWN_OPTIONS)
+            else:
+                batch[key] = block
+
+    if batch:
+        sentinel = "notebookify" + uuid.uuid4().hex
+        joined = []
+        for block in batch.values():
+            joined.extend([block, Para([Str(sentinel)])])
+        wrapper = Pandoc(Meta({}), joined[:-1])
+        output = pandoc.write(wrapper, options=MARKDOWN_OPTIONS)
+        parts = re.split(rf"^{sentinel}$", output, flags=re.MULTILINE)
+        if len(parts) == len(batch):
+            for key, part in zip(batch, parts):
+                cache[key] = part.strip("\n") + "\n"
+        else:  # unexpected output: fall back to one call per block
+            for key, block in batch.items():
+                wrapper = Pandoc(Meta({}), [block])
+                cache[key] = pandoc.write(wrapper, options=MARKDOWN_OPTIONS)
+
+    # Only keep the current blocks in the cache
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "w") as file:
+        json.dump({key: cache[key] for key in keys}, file)
+    os.replace(tmp, cache_file)
+
+    return [cache[key] for key in keys]
+
+
 def notebookify(doc):
     from pandoc.types import Pandoc, Meta, CodeBlock, Header, Para, Str, Space
 
@@ -466,6 +917,9 @@ def notebookify(doc):
     header_cell["source"] = pandoc.write(header, format="markdown-raw_attribute")
     cells.append(header_cell)
 
+    markdown_blocks = [block for block in blocks if not isinstance(block, CodeBlock)]
+    sources = iter(markdown_sources(markdown_blocks))
+
     for block in blocks:
         if isinstance(block, CodeBlock):
             source = block[1]
@@ -475,23 +929,7 @@ def notebookify(doc):
             # execution_count += 1
             cells.append(code_cell)
         else:
-            wrapper = Pandoc(Meta({}), [block])
-            options = ["-t", "markdown-smart-raw_attribute-simple_tables"]
-            # markdown-smart-raw_attribute variant
-            # ------------------------------------------------------------------
-            # -smart needed for en-dashes for example: we don't expect Jupyter
-            # cells to be smart, so we *disable* the smart output so that
-            # '–' won't get represented as '--'. Doesn't work in metadata (?)
-            # -raw_attribute so that raw html is output as HTML, not as
-            # the non-standard markdown syntax `<p>Hello</p>`{=html} that
-            # the Jupyter notebooks do not understand.
-            # ------------------------------------------------------------------
-            # UPDATE: replace this markdown variant by github-flavored
-            # markdown (for example to get a proper rendering of tables
-            # in notebooks). Arf, no, would fuck up the math. Need to
-            # find selectively what kind of tables are allowed.
-            # UPDATE: ok, the removal of simple_tables works.
-            source = pandoc.write(wrapper, options=options)
+            source = next(sources)
 
             merge_markdown = False
             if (
@@ -507,7 +945,8 @@ def notebookify(doc):
     return notebook
 
 
-notebook = notebookify(notebook_doc)
-output = open(doc_name + ".ipynb", "w")
-output.write(json.dumps(notebook, indent=2))
-output.close()
+with timed("notebook output"):
+    notebook = notebookify(notebook_doc)
+    output = open(doc_name + ".ipynb", "w")
+    output.write(json.dumps(notebook, indent=2))
+    output.close()
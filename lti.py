@@ -0,0 +1,149 @@
+"""
+Simulation of linear time-invariant systems by exact discretization
+
+The state of `dx/dt = A x + B u` is propagated from sample to sample with
+the exponential `expm(A * dt)`, computed once per distinct time step
+(instead of once per sample), for whole batches of initial states.
+"""
+
+# Third-Party Libraries
+import numpy as np
+import scipy.linalg as sla
+
+
+def _steps(t):
+    "Time steps of the grid `t` and, if they are all equal, the common step"
+    t = np.asarray(t, dtype=np.float64)
+    if t.ndim != 1 or len(t) == 0:
+        raise ValueError("t should be a non-empty 1d array")
+    dt = np.diff(t)
+    if len(dt) == 0:
+        return t, dt, 0.0
+    if np.allclose(dt, dt[0], rtol=1e-10, atol=0.0):
+        return t, dt, (t[-1] - t[0]) / (len(t) - 1)  # linspace rounding errors
+    return t, dt, None
+
+
+def _powers(E, k):
+    "Array of the powers `E^0, ..., E^(k-1)` (by doubling, log2(k) products)"
+    P = np.empty((k,) + E.shape, dtype=E.dtype)
+    P[0] = np.eye(len(E), dtype=E.dtype)
+    size, F = 1, E  # F = E^size
+    while size < k:
+        m = min(size, k - size)
+        np.matmul(F, P[:m], out=P[size : size + m])
+        size, F = size + m, F @ F
+    return P
+
+
+def _step_matrices(A, dt):
+    "Exponentials `expm(A * h)` of the distinct time steps `h` in `dt`"
+    hs, index = np.unique(dt, return_inverse=True)
+    return [sla.expm(A * h) for h in hs], index
+
+
+def expm_grid(A, t):
+    """
+    Array of the exponentials `expm(A * t_)` for every `t_` in `t`.
+
+    Same result as `array([expm(A * t_) for t_ in t])`, but only two
+    matrix exponentials are computed on uniform grids; the other samples
+    are obtained by matrix products.
+    """
+    A = np.asarray(A)
+    t, dt, h = _steps(t)
+    E0 = sla.expm(A * t[0])
+    if h is not None:
+        return _powers(sla.expm(A * h), len(t)) @ E0
+    Es, index = _step_matrices(A, dt)
+    out = np.empty((len(t),) + A.shape, dtype=E0.dtype)
+    out[0] = E0
+    for k, i in enumerate(index):
+        out[k + 1] = Es[i] @ out[k]
+    return out
+
+
+def discretize(A, B, dt):
+    """
+    Zero-order hold discretization of `dx/dt = A x + B u` with step `dt`.
+
+    Return `(Ad, Bd)` such that `x(t + dt) = Ad x(t) + Bd u` when `u`
+    is constant on `[t, t + dt]`.
+    """
+    A, B = np.atleast_2d(A), np.atleast_2d(B)
+    n, m = B.shape
+    M = np.zeros((n + m, n + m), dtype=np.result_type(A, B, float))
+    M[:n, :n], M[:n, n:] = A, B
+    E = sla.expm(M * dt)
+    return E[:n, :n], E[:n, n:]
+
+
+def simulate(A, y0, t, B=None, u=None, method="expm"):
+    """
+    States of `dx/dt = A x + B u` at the times `t`, from `x(t[0]) = y0`.
+
+    The initial state `y0` has shape `(n,)`, or `(n, N)` for a batch of
+    `N` initial states; the result has shape `(len(t),) + y0.shape` (the
+    layout of `array([expm(A * t_) for t_ in t]) @ y0` when `t[0] == 0`).
+
+    The input values `u` (shape `(len(t), m)`, or `(len(t), m, N)` for
+    one input per initial state) are held constant between samples.
+
+    Methods:
+
+      - `"expm"`: exact discretization, one matrix exponential per
+        distinct time step,
+
+      - `"eig"`: eigendecomposition of `A`, fully vectorized over time
+        (no inputs, diagonalizable and well-conditioned `A` only).
+    """
+    A = np.atleast_2d(np.asarray(A))
+    y0 = np.asarray(y0)
+    t, dt, h = _steps(t)
+    real = np.isrealobj(A) and np.isrealobj(y0)
+
+    if u is not None:
+        if B is None:
+            raise ValueError("inputs u given without an input matrix B")
+        if method != "expm":
+            raise ValueError(f"method {method!r} does not support inputs")
+        return _simulate_inputs(A, np.atleast_2d(B), y0, t, dt, h, np.asarray(u))
+
+    if method == "eig":
+        s, V = np.linalg.eig(A)
+        if np.linalg.cond(V) > 1e8:
+            raise ValueError("A is not (numerically) diagonalizable, use 'expm'")
+        w = np.linalg.solve(V, y0.reshape(len(A), -1))  # (n, N)
+        exp_st = np.exp(np.multiply.outer(t - t[0], s))  # (len(t), n)
+        yt = (V * exp_st[:, np.newaxis, :]) @ w
+        yt = yt.reshape((len(t),) + y0.shape)
+        return yt.real if real else yt
+    elif method != "expm":
+        raise ValueError(f"unknown method {method!r}")
+
+    if h is not None:
+        return np.matmul(_powers(sla.expm(A * h), len(t)), y0)
+    Es, index = _step_matrices(A, dt)
+    yt = np.empty((len(t),) + y0.shape, dtype=np.result_type(Es[0], y0))
+    yt[0] = y0
+    for k, i in enumerate(index):
+        np.matmul(Es[i], yt[k], out=yt[k + 1])
+    return yt
+
+
+def _simulate_inputs(A, B, y0, t, dt, h, u):
+    if len(u) != len(t):
+        raise ValueError("u should have one sample per time in t")
+    if h is not None:
+        steps, index = [discretize(A, B, h)], np.zeros(len(dt), dtype=int)
+    else:
+        hs, index = np.unique(dt, return_inverse=True)
+        steps = [discretize(A, B, h) for h in hs]
+    shape = (len(t),) + np.broadcast_shapes(y0.shape, (len(A),) + u.shape[2:])
+    dtype = np.result_type(A, B, y0, u, float)
+    yt = np.empty(shape, dtype=dtype)
+    yt[0] = y0
+    for k, i in enumerate(index):
+        Ad, Bd = steps[i]
+        yt[k + 1] = Ad @ yt[k] + Bd @ u[k]
+    return yt
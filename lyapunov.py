@@ -0,0 +1,110 @@
+"""
+Numerical certification of Lyapunov functions on grids and sample clouds
+
+`V(x)` is a candidate Lyapunov function for the vector field `f(x)` (for
+example `V(x) = x.T @ Pi @ x` with `Pi` given by `solve_continuous_are`).
+Both are vectorized: `x` has shape `(n, N)` (one state per column), `V(x)`
+shape `(N,)` and `f(x)` shape `(n, N)`. `V` is written with `autograd.numpy`
+so that its gradient is computed by automatic differentiation.
+
+The points are processed in chunks of `chunk_size` states, so that memory
+use stays bounded on multi-million-point grids.
+"""
+
+# Third-Party Libraries
+import autograd
+import autograd.numpy as anp
+import numpy as np
+
+
+def quadratic(Pi, equilibrium=None):
+    "Quadratic form `V(x) = (x - x_eq).T @ Pi @ (x - x_eq)`"
+    Pi = np.asarray(Pi, dtype=np.float64)
+    x_eq = np.zeros((len(Pi), 1)) if equilibrium is None else np.reshape(equilibrium, (-1, 1))
+
+    def V(x):
+        dx = x - x_eq
+        return anp.sum(dx * anp.dot(Pi, dx), axis=0)
+
+    return V
+
+
+def derivative(V, f):
+    "Derivative of `V` along the trajectories of `f`: `dV(x) = ∇V(x) · f(x)`"
+    grad_V = autograd.grad(lambda x: anp.sum(V(x)))  # columns are independent
+
+    def dV(x):
+        return np.sum(grad_V(x) * f(x), axis=0)
+
+    return dV
+
+
+def evaluate(V, f, points, chunk_size=65536):
+    """
+    Values of `V` and `dV` at the `points` (shape `(n, N)`), computed by
+    chunks; return two arrays of shape `(N,)`.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    dV = derivative(V, f)
+    N = points.shape[1]
+    values, derivatives = np.empty(N), np.empty(N)
+    for start in range(0, N, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        x = points[:, chunk]
+        values[chunk], derivatives[chunk] = V(x), dV(x)
+    return values, derivatives
+
+
+def grid(low, high, shape, chunk_size=65536):
+    """
+    Iterate over the points of the regular grid of the box `[low, high]`
+    with `shape` points per axis, by chunks: yield arrays `x` (shape
+    `(n, k)`) and the mask of the points on the boundary of the box.
+    """
+    axes = [np.linspace(l, h, s) for l, h, s in zip(low, high, shape)]
+    size = int(np.prod(shape))
+    for start in range(0, size, chunk_size):
+        index = np.unravel_index(np.arange(start, min(start + chunk_size, size)), shape)
+        x = np.array([a[i] for a, i in zip(axes, index)])
+        boundary = np.zeros(x.shape[1], dtype=bool)
+        for i, s in zip(index, shape):
+            boundary |= (i == 0) | (i == s - 1)
+        yield x, boundary
+
+
+def certify(V, f, chunks, equilibrium=None, radius=0.0):
+    """
+    Largest level `c` such that `dV < 0` at every sampled point `x` of the
+    sublevel set `{V(x) < c}` (the points within `radius` of the equilibrium
+    excepted) and such that this set does not reach the sampled boundary.
+
+    `chunks` yields arrays of points `x` (shape `(n, k)`), or pairs
+    `(x, boundary)` where `boundary` flags the points on the boundary of
+    the sampled region (see `grid`). The equilibrium itself (`V = 0`) is
+    never a violation.
+
+    The level is the smallest value of `V` over the violations (`dV >= 0`)
+    and the boundary points, computed in a single pass over the chunks.
+    """
+    dV = derivative(V, f)
+    level = np.inf
+    for chunk in chunks:
+        x, boundary = chunk if isinstance(chunk, tuple) else (chunk, None)
+        x = np.asarray(x, dtype=np.float64)
+        values, derivatives = V(x), dV(x)
+        bad = ~(derivatives < 0.0) & (values > 0.0)  # V = 0: equilibrium
+        if equilibrium is not None:
+            distance = np.linalg.norm(x - np.reshape(equilibrium, (-1, 1)), axis=0)
+            bad &= distance > radius
+        if boundary is not None:
+            bad |= boundary
+        if np.any(bad):
+            level = min(level, np.amin(values[bad]))
+    return level
+
+
+def certify_grid(V, f, low, high, shape, equilibrium=None, radius=0.0,
+                 chunk_size=65536):
+    "Level certified by `certify` on the regular grid of the box `[low, high]`"
+    chunks = grid(low, high, shape, chunk_size)
+    return certify(V, f, chunks, equilibrium, radius)
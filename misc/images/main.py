@@ -1,9 +1,15 @@
 #!/usr/bin/env python
 
-# Python 2.7 Standard Library
+# Python Standard Library
 from __future__ import division
+import concurrent.futures
 import gc
+import hashlib
+import io
+import json
 import os
+import pickle
+import pickletools
 
 # Third-Party Packages
 import numpy as np; np.seterr(all="ignore")
@@ -41,18 +47,113 @@ mpl.backend_bases.register_backend("pdf", FigureCanvasPgf)
 # The width of the standard LaTeX document is 345.0 pt.
 width_in = 345.0 / 72.0 # nota: text height = 598 pt for A4, 550 pt for US Letter.
 
-def save(name, dpi=None):
+#
+# Figure Export
+# ------------------------------------------------------------------------------
+#
+# The figure is serialized once and the formats are rendered in parallel
+# worker processes (PDF and PGF both run LaTeX). A format is skipped when
+# the figure and the existing output file are the same as in the last run.
+#
+FORMATS = ["pdf", "png", "pgf", "svg"]
+ROOT = os.path.dirname(os.path.realpath(__file__))
+CACHE = os.path.join(ROOT, ".export-cache.json")
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class _FigurePickler(pickle.Pickler):
+    "Pickler that leaves out the callback registries (and their counters)"
+    def reducer_override(self, obj):
+        if isinstance(obj, mpl.cbook.CallbackRegistry):
+            return (str, ("CallbackRegistry",))
+        return NotImplemented
+
+def figure_hash(fig, options):
+    """
+    Hash of a figure, the save options and the rc parameters.
+
+    Pickled figures embed object ids (transform trees); these are replaced
+    by their order of appearance so that the hash is stable across runs.
+    """
+    buffer = io.BytesIO()
+    _FigurePickler(buffer).dump(fig)
+    digest = hashlib.sha256()
+    digest.update(repr(sorted(options.items())).encode("utf-8"))
+    digest.update(repr(sorted(mpl.rcParams.items())).encode("utf-8"))
+    ids = {}
+    for opcode, arg, _ in pickletools.genops(buffer.getvalue()):
+        if opcode.name == "FRAME":
+            continue
+        if opcode.name in ("LONG1", "LONG4") and abs(arg) >= 2 ** 32:
+            arg = ids.setdefault(arg, len(ids))
+        digest.update(("%s %r\n" % (opcode.name, arg)).encode("utf-8"))
+    return digest.hexdigest()
+
+def render(fig_pickle, path, format, options):
+    "Render a pickled figure to `path`; return the hash of the output file"
+    fig = pickle.loads(fig_pickle)
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        fig.savefig(tmp, format=format, **options)
+        os.replace(tmp, path)
+    finally:
+        pp.close(fig)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return file_hash(path)
+
+def load_cache():
+    try:
+        with open(CACHE) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def store_cache(cache):
+    tmp = "%s.%d.tmp" % (CACHE, os.getpid())
+    with open(tmp, "w") as file:
+        json.dump(cache, file, indent=2, sort_keys=True)
+    os.replace(tmp, CACHE)
+
+def save(name, dpi=None, formats=FORMATS, workers=None):
     options = {} #{"bbox_inches": "tight"}
     if dpi:
         options["dpi"] = dpi
-    cwd = os.getcwd()
-    root = os.path.dirname(os.path.realpath(__file__))
-    os.chdir(root)
-    pp.savefig(name + ".pdf", **options)
-    pp.savefig(name + ".png", **options)
-    pp.savefig(name + ".pgf", **options)
-    pp.savefig(name + ".svg", **options)
-    os.chdir(cwd)
+    fig = pp.gcf()
+    fig_pickle = pickle.dumps(fig)
+    key = figure_hash(fig, options)
+    cache = load_cache()
+
+    todo = []
+    for format in formats:
+        filename = name + "." + format
+        path = os.path.join(ROOT, filename)
+        entry = cache.get(filename, {})
+        if (entry.get("figure") == key and os.path.exists(path)
+            and entry.get("output") == file_hash(path)):
+            continue
+        todo.append((filename, path, format))
+
+    if len(todo) <= 1 or workers == 1:
+        outputs = [render(fig_pickle, path, format, options)
+                   for _, path, format in todo]
+    else:
+        workers = workers or len(todo)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render, fig_pickle, path, format, options)
+                       for _, path, format in todo]
+            outputs = [future.result() for future in futures]
+
+    if todo:
+        cache = load_cache()  # other figures may have been saved meanwhile
+        for (filename, _, _), output in zip(todo, outputs):
+            cache[filename] = {"figure": key, "output": output}
+        store_cache(cache)
 
 def set_ratio(ratio=1.0, bottom=0.1, top=0.1, left=0.1, right=0.1):
     height_in = (1.0 - left - right)/(1.0 - bottom - top) * width_in / ratio
@@ -0,0 +1,46 @@
+"""
+Multiple initial values problems: solvers, trajectory stores and movies
+
+The submodules are imported on first use (PEP 562 module `__getattr__`):
+`import mivp` is almost free, the solvers only import numpy and scipy, and
+matplotlib is only loaded by `generate_movie`.
+
+  - `mivp.integrate`: `solve`, `solve_alt`,
+  - `mivp.batch`: `solve_batch`, `BatchSolution`,
+  - `mivp.fixed`: `solve_fixed`,
+  - `mivp.store`: `get_data`, `load_data`, `cached_data`, `open_store`,
+  - `mivp.movie`: `generate_movie`.
+"""
+
+# Python Standard Library
+import importlib
+
+_submodules = {
+    "solve": "integrate",
+    "solve_alt": "integrate",
+    "solve_batch": "batch",
+    "BatchSolution": "batch",
+    "solve_fixed": "fixed",
+    "get_data": "store",
+    "load_data": "store",
+    "cached_data": "store",
+    "open_store": "store",
+    "generate_movie": "movie",
+}
+
+__all__ = list(_submodules)
+
+
+def __getattr__(name):
+    if name in _submodules:
+        module = importlib.import_module(f".{_submodules[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value  # next accesses bypass __getattr__
+        return value
+    if name in set(_submodules.values()):
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
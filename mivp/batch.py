@@ -0,0 +1,268 @@
+"""
+Batched ensemble integration: all the initial values as a single vectorized ODE
+"""
+
+# Third-Party Libraries
+import numpy as np
+
+
+# Dormand-Prince 5(4) coefficients (the scheme behind solve_ivp's "RK45").
+_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+_E = np.array(
+    [-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40]
+)
+# Continuous extension (solve_ivp's dense output): on a step of size `h`
+# from `y`, `y(t + x h) = y + h * sum_i (K.T @ _P)[:, i] x^(i + 1)`.
+_P = np.array([
+    [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+
+class BatchSolution:
+    """
+    Dormand-Prince continuous extension shared by all the trajectories of a
+    batch (the dense output of `solve_ivp`).
+
+    Only the samples active during a step are stored: the step from `ts[k]`
+    to `ts[k + 1]` of sample `i` has the key `k * m + i` in the sorted array
+    `keys`; the matching columns of `ys` (shape `(n, len(keys))`) and `Qs`
+    (shape `(4, n, len(keys))`) are its initial state and interpolation
+    coefficients. Sample `i` is frozen at `y_stop[:, i]` after `t_stop[i]`
+    (masked or failed samples).
+    """
+
+    def __init__(self, ts, keys, ys, Qs, t_stop, y_stop):
+        self.ts, self.keys, self.ys, self.Qs = ts, keys, ys, Qs
+        self.t_stop, self.y_stop = t_stop, y_stop
+
+    def __call__(self, t, samples=None):
+        "Evaluate the selected samples at times `t`; shape `(len(t), n, m)`"
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        ts, m = self.ts, self.y_stop.shape[1]
+        if samples is None:
+            samples = np.arange(m)
+        samples = np.atleast_1d(samples)
+        y_stop = self.y_stop[:, samples]
+        if len(self.keys) == 0:
+            return np.broadcast_to(y_stop, (len(t),) + y_stop.shape).copy()
+        t = np.minimum(t[:, None], self.t_stop[samples])  # (k, m)
+        k = np.clip(np.searchsorted(ts, t, side="right") - 1, 0, len(ts) - 2)
+        keys = k * m + samples
+        j = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        stored = self.keys[j] == keys  # else, the sample is frozen
+        h = ts[k + 1] - ts[k]
+        x = (t - ts[k]) / h
+        powers = np.cumprod(np.broadcast_to(x[:, :, None], x.shape + (4,)), axis=2)
+        y = self.ys[:, j] + h * np.einsum("pnkm,kmp->nkm", self.Qs[:, :, j], powers)
+        y = np.where(stored, y, y_stop[:, None, :])  # (n, k, m)
+        return np.swapaxes(y, 0, 1)
+
+
+class _SampleSolution:
+    def __init__(self, batch, index):
+        self.batch, self.index = batch, index
+
+    def __call__(self, t):
+        scalar = np.ndim(t) == 0
+        y = self.batch(t, self.index)[:, :, 0].T  # (n, k)
+        return y[:, 0] if scalar else y
+
+
+def _rms(x):
+    return np.sqrt(np.mean(x * x, axis=0))
+
+
+def solve_batch(fun, t_span, y0s, rtol=1e-3, atol=1e-6, t_eval=None,
+                dense_output=False, mask=None, max_step=np.inf, first_step=None,
+                method="RK45", **kwargs):
+    """
+    Integrate all the initial states `y0s` as a single vectorized ODE.
+
+    `fun(t, y)` is called once per stage on an array `y` of shape
+    `(n, m)` whose columns are the active samples and should return an
+    array of the same shape. The step size is shared, but the error
+    control is performed for each trajectory and every active trajectory
+    must meet its tolerance for a step to be accepted.
+
+    The optional `mask(t, y)` returns a boolean array of shape `(m,)`;
+    samples flagged as `True` (for example, converged or diverged) are
+    frozen at their current state and removed from subsequent steps.
+
+    As in `solve_ivp`, a trial step with non-finite values is rejected
+    and the step size reduced. The samples that still fail to meet their
+    tolerance at the minimal step size (for example, trajectories that
+    escape to infinity in finite time) are frozen with status `-1`.
+
+    With `t_eval`, the states are interpolated at these times as the steps
+    are taken, and the dense output (the `sol` attribute of the results,
+    needed by `get_data`) is only kept if `dense_output` is set; without
+    `t_eval`, it is always kept. Only the samples active during a step
+    are stored.
+
+    Returns a list of `solve_ivp`-like results.
+    """
+    # Local import: scipy.optimize is only needed to build the results.
+    from scipy.optimize import OptimizeResult
+
+    if method != "RK45":
+        raise ValueError(f"batched integration only supports RK45, not {method!r}")
+    if kwargs:
+        raise TypeError(f"unsupported options in batch mode: {sorted(kwargs)}")
+
+    t0, t1 = map(float, t_span)
+    if t1 < t0:
+        raise ValueError("batched integration requires t_span[0] <= t_span[1]")
+    y = np.array(y0s, dtype=np.float64).T  # (n, m)
+    n, m = y.shape
+    rtol = max(rtol, 100 * np.finfo(np.float64).eps)
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=np.float64)
+        if np.any(np.diff(t_eval) < 0) or np.any((t_eval < t0) | (t_eval > t1)):
+            raise ValueError("t_eval should be sorted and within t_span")
+        y_eval = np.empty((len(t_eval), n, m))
+        j = int(np.searchsorted(t_eval, t0, side="right"))
+        y_eval[:j] = y
+    dense = t_eval is None or dense_output
+
+    active = np.ones(m, dtype=bool)
+    t_stop = np.full(m, t1)
+    status = np.zeros(m, dtype=int)
+    nfev = 0
+
+    def F(t, y):
+        nonlocal nfev
+        nfev += 1
+        return np.asarray(fun(t, y), dtype=np.float64).reshape(y.shape)
+
+    f = np.zeros_like(y)
+    f[:] = F(t0, y)
+
+    if mask is not None:
+        masked = np.asarray(mask(t0, y), dtype=bool)
+        active &= ~masked
+        t_stop[masked] = t0
+        status[masked] = 1
+
+    if first_step is None:
+        scale = atol + np.abs(y[:, active]) * rtol
+        d0, d1 = _rms(y[:, active] / scale), _rms(f[:, active] / scale)
+        d0, d1 = np.max(d0, initial=0.0), np.max(d1, initial=0.0)
+        h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    else:
+        h = first_step
+    h = min(h, max_step, abs(t1 - t0))
+
+    ts, keys, ys, Qs = [t0], [], [], []  # dense output (active samples)
+    K = np.empty((7, n, m))
+    t = t0
+    while t < t1 and np.any(active):
+        y_a, f_a = y[:, active], f[:, active]
+        h_min = 10 * (np.nextafter(t, np.inf) - t)
+        rejected = False
+        while True:
+            h = max(h, h_min)
+            h_s = min(h, t1 - t)
+            k = K[:, :, : y_a.shape[1]]
+            k[0] = f_a
+            # overflows are expected from diverging samples
+            with np.errstate(over="ignore", invalid="ignore"):
+                for s in range(1, 6):
+                    dy = np.tensordot(_A[s], k[:s], axes=(0, 0)) * h_s
+                    k[s] = F(t + _C[s] * h_s, y_a + dy)
+                y_new = y_a + h_s * np.tensordot(_B, k[:6], axes=(0, 0))
+                k[6] = F(t + h_s, y_new)
+                err = h_s * np.tensordot(_E, k, axes=(0, 0))
+                scale = atol + np.maximum(np.abs(y_a), np.abs(y_new)) * rtol
+                errors = _rms(err / scale)
+            finite = np.all(np.isfinite(k), axis=(0, 1)) & np.all(np.isfinite(y_new), axis=0)
+            errors[~finite] = np.inf
+            err_max = np.max(errors)
+            if err_max <= 1.0 or h <= h_min:
+                break
+            h *= max(0.2, 0.9 * err_max ** -0.2)
+            rejected = True
+
+        # At the minimal step size, the samples that still fail are frozen.
+        ok = errors <= 1.0
+        t_new = t + h_s
+        idx = np.flatnonzero(active)
+        Q = np.tensordot(_P, k[:, :, ok], axes=(0, 0))  # (4, n, ok samples)
+        if t_eval is not None:
+            j_new = int(np.searchsorted(t_eval, t_new, side="right"))
+            x = (t_eval[j:j_new] - t) / h_s
+            powers = np.cumprod(np.broadcast_to(x[:, None], (len(x), 4)), axis=1)
+            y_eval[j:j_new, :, idx[ok]] = (
+                y_a[:, ok] + h_s * np.einsum("pnm,kp->knm", Q, powers)
+            )
+            j = j_new
+        if dense:
+            keys.append((len(ts) - 1) * m + idx[ok])
+            ys.append(y_a[:, ok])
+            Qs.append(Q)
+        failed = idx[~ok]
+        y[:, idx[ok]] = y_new[:, ok]
+        f[:, idx[ok]] = k[6][:, ok]
+        active[failed] = False
+        t_stop[failed] = t
+        status[failed] = -1
+        if mask is not None and np.any(active):
+            masked = np.zeros(m, dtype=bool)
+            masked[active] = np.asarray(mask(t_new, y[:, active]), dtype=bool)
+            active &= ~masked
+            t_stop[masked] = t_new
+            status[masked] = 1
+        t = t_new
+        ts.append(t)
+        err_max = np.max(errors[ok], initial=0.0)
+        factor = 10.0 if err_max == 0 else min(10.0, 0.9 * err_max ** -0.2)
+        if rejected:  # as solve_ivp: no growth right after a rejected step
+            factor = min(1.0, factor)
+        h = min(h * factor, max_step)
+
+    batch = None
+    if dense:  # (one list at a time: the memory of the steps is freed)
+        keys = np.concatenate(keys) if keys else np.empty(0, dtype=int)
+        ys = np.concatenate(ys, axis=1) if ys else np.empty((n, 0))
+        Qs = np.concatenate(Qs, axis=2) if Qs else np.empty((4, n, 0))
+        batch = BatchSolution(np.array(ts), keys, ys, Qs, t_stop, y)
+    if t_eval is not None:  # frozen samples
+        frozen = t_eval[:, None] > t_stop
+        y_eval = np.where(frozen[:, None, :], y, y_eval)
+
+    results = []
+    ts = np.array(ts)
+    for i in range(m):
+        sol = None if batch is None else _SampleSolution(batch, i)
+        if t_eval is not None:
+            t_i, y_i = t_eval, y_eval[:, :, i].T
+        else:
+            t_i = ts[ts <= t_stop[i]]
+            y_i = sol(t_i)
+        message = {
+            -1: "Required step size is less than spacing between numbers.",
+            0: "Success.",
+            1: "Sample masked.",
+        }[status[i]]
+        results.append(
+            OptimizeResult(
+                t=t_i, y=y_i, sol=sol, status=int(status[i]),
+                message=message, success=bool(status[i] >= 0), nfev=nfev,
+                t_stop=float(t_stop[i]),
+            )
+        )
+    return results
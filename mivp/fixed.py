@@ -0,0 +1,111 @@
+"""
+Fixed-step integration of batches of initial values (Euler, Heun, RK4, Verlet)
+
+For smooth, non-stiff vector fields a fixed step is enough and much cheaper
+than the adaptive `solve_ivp`. All the initial states are integrated at once
+(`fun(t, y)` is called on arrays `y` of shape `(n, N)`) and the states are
+written into a preallocated array of shape `(n, N, n_samples)`.
+"""
+
+# Third-Party Libraries
+import numpy as np
+
+
+def _euler(fun, t, y, dt):
+    return y + dt * fun(t, y)
+
+
+def _heun(fun, t, y, dt):
+    k1 = fun(t, y)
+    k2 = fun(t + dt, y + dt * k1)
+    return y + 0.5 * dt * (k1 + k2)
+
+
+def _rk4(fun, t, y, dt):
+    k1 = fun(t, y)
+    k2 = fun(t + 0.5 * dt, y + 0.5 * dt * k1)
+    k3 = fun(t + 0.5 * dt, y + 0.5 * dt * k2)
+    k4 = fun(t + dt, y + dt * k3)
+    return y + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+
+def _verlet(fun, t, y, dt):
+    # Velocity Verlet; y = (q, v) and fun(t, y) = (v, a). The acceleration
+    # at the end of the step is evaluated with the half-step velocity.
+    n = len(y) // 2
+    y_new = np.empty_like(y)
+    y_new[n:] = y[n:] + 0.5 * dt * fun(t, y)[n:]
+    y_new[:n] = y[:n] + dt * y_new[n:]
+    y_new[n:] += 0.5 * dt * fun(t + dt, y_new)[n:]
+    return y_new
+
+
+_BLOCK = 64
+
+_STEPS = {"Euler": _euler, "Heun": _heun, "RK4": _rk4, "Verlet": _verlet}
+
+
+def solve_fixed(fun, t_span, y0s, dt, method="RK4", decimation=1, out=None):
+    """
+    Integrate the initial states `y0s` (shape `(N, n)`) with a fixed step.
+
+    The number of steps is rounded up so that `(t1 - t0)` is a multiple of
+    the actual step, which is never larger than `dt` (positive; the steps
+    are negative when `t1 < t0`). Only one state out of `decimation`
+    steps is stored, so that memory does not grow with the number of
+    steps on long horizons; the final state (at `t1`) is always stored.
+
+    The `"Verlet"` method applies to second-order systems whose state is
+    `y = (q, v)` with `fun(t, y) = (v, a)` (only the second half of the
+    field is used). It is symplectic when the acceleration `a` does not
+    depend on the velocity `v`.
+
+    Returns `t` (shape `(n_samples,)`) and `y` (shape `(n, N, n_samples)`,
+    or `(n, n_samples)` for a single initial state `y0s` of shape `(n,)`).
+    The states may be written into a preallocated array `out` (for example
+    a memory map) of shape `(n, N, n_samples)`.
+    """
+    try:
+        step = _STEPS[method]
+    except KeyError:
+        raise ValueError(f"unknown method {method!r}, expected one of {list(_STEPS)}")
+    t0, t1 = map(float, t_span)
+    y0s = np.asarray(y0s, dtype=np.float64)
+    single = y0s.ndim == 1
+    y = np.atleast_2d(y0s).T.copy()  # (n, N)
+    n, N = y.shape
+    if method == "Verlet" and n % 2:
+        raise ValueError("the Verlet method requires a state of even dimension (q, v)")
+
+    if not dt > 0:
+        raise ValueError(f"the step dt should be positive, not {dt!r}")
+    if decimation < 1:
+        raise ValueError(f"decimation should be a positive integer, not {decimation!r}")
+    n_steps = max(1, int(np.ceil(abs(t1 - t0) / dt - 1e-9)))
+    dt = (t1 - t0) / n_steps
+    steps = np.r_[0 : n_steps + 1 : decimation]
+    if steps[-1] != n_steps:
+        steps = np.r_[steps, n_steps]
+    n_samples = len(steps)
+    t = t0 + dt * steps
+    t[-1] = t1
+    if out is None:
+        out = np.empty((n, N, n_samples))
+    elif out.shape != (n, N, n_samples):
+        raise ValueError(f"out has shape {out.shape}, expected {(n, N, n_samples)}")
+
+    # The samples are gathered in a small time-major block, copied to the
+    # (sample-last) output once full: writing each state directly into
+    # `out[:, :, j]` is a strided, cache-unfriendly copy.
+    block = np.empty((_BLOCK, n, N))
+    block[0], j0 = y, 0
+    for i in range(1, n_steps + 1):
+        y = step(fun, t0 + (i - 1) * dt, y, dt)
+        if i % decimation == 0 or i == n_steps:
+            j = n_samples - 1 if i == n_steps else i // decimation
+            if j - j0 == _BLOCK:
+                out[:, :, j0:j] = np.moveaxis(block, 0, -1)
+                j0 = j
+            block[j - j0] = y
+    out[:, :, j0:] = np.moveaxis(block[: n_samples - j0], 0, -1)
+    return t, (out[:, 0] if single else out)
@@ -0,0 +1,185 @@
+"""
+Solvers: sets of initial values (`solve`) and boundaries (`solve_alt`)
+"""
+
+# Python Standard Library
+import concurrent.futures
+import functools
+import heapq
+
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+
+# Local Library
+from .batch import solve_batch
+from .store import cached_data, open_store
+
+
+def solve(**kwargs):
+    # With `stream=True`, the trajectories are sampled at the times `t_eval`
+    # during the integration and the array of shape `(len(t_eval), n,
+    # len(y0s))` is returned instead of the results (see `_stream`); it
+    # may be written to a trajectory store (`filename` and `key`).
+    kwargs = kwargs.copy()
+    if kwargs.pop("stream", False):
+        return _solve_stream(**kwargs)
+    if kwargs.pop("batch", False):
+        kwargs["dense_output"] = True
+        return solve_batch(**kwargs)
+    kwargs["dense_output"] = True
+    y0s = kwargs["y0s"]
+    del kwargs["y0s"]
+    results = []
+    for y0 in y0s:
+        kwargs["y0"] = y0
+        result = sci.solve_ivp(**kwargs)
+        results.append(result)
+    return results
+
+
+def _stream(solver, t, out):
+    """
+    Step the `solver` to the end and write its states at times `t` into
+    `out` (shape `(len(t), n)`), with the interpolant of each step.
+
+    Each interpolant is dropped once used, hence the memory used does not
+    depend on the number of steps. The frames after a failure are `nan`.
+    """
+    direction = 1.0 if solver.direction >= 0 else -1.0
+    t_ = direction * np.asarray(t)
+    j = int(np.searchsorted(t_, direction * solver.t, side="right"))
+    out[:j] = solver.y
+    while j < len(t):
+        next_frame = t_[j].item()  # Python floats: cheap test at each step
+        while direction * solver.t < next_frame and solver.status == "running":
+            solver.step()
+        if solver.status == "failed" or direction * solver.t < next_frame:
+            break
+        k = int(np.searchsorted(t_, direction * solver.t, side="right"))
+        out[j:k] = solver.dense_output()(t[j:k]).T
+        j = k
+    out[j:] = np.nan
+
+
+def _solve_stream(fun, y0s, t_eval, t_span=None, method="RK45", args=None,
+                  filename=None, key=None, **options):
+    if filename is not None and key is not None:
+        cached = cached_data(filename, key)
+        if cached is not None:
+            return cached
+    options.pop("dense_output", None)
+    if options.pop("events", None) is not None:
+        raise TypeError("events are not supported in stream mode")
+    if args is not None:
+        fun = lambda t, y, fun=fun: fun(t, y, *args)
+    if isinstance(method, str):
+        method = getattr(sci, method)  # RK45, RK23, DOP853, Radau, BDF, LSODA
+    t = np.asarray(t_eval, dtype=np.float64)
+    t0, t1 = (t[0], t[-1]) if t_span is None else t_span
+    y0s = np.asarray(y0s, dtype=np.float64)
+    store = open_store(filename, (len(t), y0s.shape[1], len(y0s)), key)
+    with store as data:
+        for i, y0 in enumerate(y0s):
+            solver = method(fun, t0, y0, t1, **options)
+            out = np.empty((len(t), len(y0)))
+            _stream(solver, t, out)
+            data[:, :, i] = out
+    return store.data
+
+
+def _solve_one(kwargs, y0):
+    return sci.solve_ivp(**kwargs, y0=y0).y
+
+
+def _solve_all(kwargs, y0s, executor=None):
+    # Executor.map preserves the order of the initial states, hence the
+    # results do not depend on the scheduling of the solves.
+    solve_one = functools.partial(_solve_one, kwargs)
+    if executor is None:
+        return list(map(solve_one, y0s))
+    else:
+        return list(executor.map(solve_one, y0s))
+
+
+def _gap(a, b):
+    "Largest distance between two trajectories sampled at the same times"
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    return np.amax(np.sqrt(dx * dx + dy * dy))
+
+
+def solve_alt(**kwargs):
+    # The independent solves of each refinement round may be dispatched
+    # to a concurrent.futures executor (given, or a process pool with
+    # `workers` processes). With processes, `fun` needs to be picklable.
+    # With a `filename`, the result is written to a trajectory store, which
+    # is reopened instead of solved again when it has the same `key`.
+    filename, key = kwargs.get("filename"), kwargs.get("key")
+    if filename is not None and key is not None:
+        cached = cached_data(filename, key)
+        if cached is not None:
+            return cached
+    executor = kwargs.get("executor")
+    workers = kwargs.get("workers")
+    if executor is None and workers is not None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return solve_alt(**dict(kwargs, executor=executor))
+    kwargs = kwargs.copy()
+    kwargs.pop("executor", None)
+    kwargs.pop("workers", None)
+    kwargs.pop("filename", None)
+    kwargs.pop("key", None)
+    boundary = kwargs.pop("boundary")
+    boundary_atol = kwargs.pop("boundary_atol", 0.01)
+    boundary_rtol = kwargs.pop("boundary_rtol", 0.1)
+    t_eval = kwargs["t_eval"]
+    kwargs["t_span"] = (t_eval[0], t_eval[-1])
+
+    # Boundary trajectories, indexed by their parameter s in [0, 1].
+    s = np.linspace(0.0, 1.0, 4)
+    data = dict(zip(s, _solve_all(kwargs, boundary(s), executor)))
+
+    # The tolerance depends on the smallest distance to the origin among
+    # the boundary trajectories (the last time sample excepted).
+    d_min = np.inf
+
+    def update_error(trajectories):
+        nonlocal d_min
+        for y in trajectories:
+            x_, y_ = y[0, :-1], y[1, :-1]
+            d_min = min(d_min, np.amin(np.sqrt(x_ * x_ + y_ * y_), initial=np.inf))
+        return boundary_atol + boundary_rtol * d_min
+
+    error = update_error(data.values())
+
+    # Max-heap (via negated gaps) of the segments between consecutive
+    # boundary points; a segment is never modified, only split.
+    heap = []
+
+    def push(s0, s1):
+        gap = _gap(data[s0], data[s1])
+        if np.isfinite(gap):  # nan gaps (e.g. through the origin) can't be fixed
+            heapq.heappush(heap, (-gap, s0, s1))
+
+    for s0, s1 in zip(s[:-1], s[1:]):
+        push(s0, s1)
+
+    # Refinement rounds: split every segment that is too large at once.
+    while heap and -heap[0][0] > error:
+        segments = []
+        while heap and -heap[0][0] > error:
+            _, s0, s1 = heapq.heappop(heap)
+            segments.append((s0, s1))
+        s_new = np.array([0.5 * (s0 + s1) for s0, s1 in segments])
+        trajectories = _solve_all(kwargs, boundary(s_new), executor)
+        data.update(zip(s_new, trajectories))
+        for (s0, s1), s_mid in zip(segments, s_new):
+            push(s0, s_mid)
+            push(s_mid, s1)
+        error = update_error(trajectories)
+
+    store = open_store(filename, (len(t_eval), 2, len(data)), key)
+    with store as reshaped_data:
+        for i, s_ in enumerate(sorted(data)):
+            reshaped_data[:, :, i] = data.pop(s_).T  # one trajectory at a time
+    return store.data
@@ -0,0 +1,225 @@
+"""
+Movies of the evolution of sets of initial values (the only part of `mivp`
+that needs matplotlib)
+"""
+
+# Python Standard Library
+import concurrent.futures
+import contextlib
+import itertools
+import os
+import pickle
+import subprocess
+import tempfile
+
+# Third-Party Libraries
+import numpy as np
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Local Library
+from .store import load_data
+
+
+def generate_movie(data, filename, fps, axes=None, progress=None, dpi=300,
+                   workers=None, **options):
+    # With several workers, chunks of frames are rendered in parallel
+    # processes (each with a copy of the figure); the movie is the same as
+    # with a single process (see `_write_movie_parallel`).
+    #print(axes, options)
+    fig = None
+    if axes:
+        fig = axes.get_figure()
+    if not fig:
+        fig = plt.figure(figsize=(16, 9))
+        axes = fig.subplots()
+        axes.axis("equal")
+        ratio = 16 / 9
+        x_max = np.amax(data[:, 0, :])
+        x_min = np.amin(data[:, 0, :])
+        y_max = np.amax(data[:, 1, :])
+        y_min = np.amin(data[:, 1, :])
+
+        # Create a margin
+        x_c, y_c = 0.5 * (x_max + x_min), 0.5 * (y_max + y_min)
+        width, height = x_max - x_min, y_max - y_min
+        x_min = x_min - 0.1 * width
+        x_max = x_max + 0.1 * width
+        y_min = y_min - 0.1 * width
+        y_max = y_max + 0.1 * width
+        width, height = x_max - x_min, y_max - y_min
+
+        if width / height <= ratio:  # adjust width
+            width = height * ratio
+            x_min, x_max = x_c - 0.5 * width, x_c + 0.5 * width
+        else:  # adjust height
+            height = width / ratio
+            y_min, y_max = y_c - 0.5 * height, y_c + 0.5 * height
+        axes.axis([x_min, x_max, y_min, y_max])
+        fig.subplots_adjust(0, 0, 1, 1)
+        axes.axis("off")
+
+    # A single polygon, updated in place
+    x, y = data[0]
+    polygon = axes.fill(x, y, **options)[0]
+
+    if workers is None or workers <= 1:
+        _write_movie(fig, axes, polygon, data, filename, fps, dpi, progress)
+    else:
+        _write_movie_parallel(fig, axes, polygon, data, filename, fps, dpi,
+                              progress, workers)
+
+
+def _write_movie(fig, axes, polygon, data, filename, fps, dpi, progress=None,
+                 lossless=False):
+    "Render and encode the frames; return their size `(width, height)`"
+    n = len(data)
+    frames = _render_frames(fig, axes, polygon, data, dpi)
+    first = next(frames)
+    height, width, _ = first.shape
+    with _ffmpeg_pipe(filename, fps, (width, height), lossless) as pipe:
+        for i, frame in enumerate(itertools.chain([first], frames)):
+            pipe.write(frame)
+            if progress:
+                progress(i, n)
+    return width, height
+
+
+def _write_segment(fig_pickle, axes_index, polygon_index, data, filename, fps, dpi):
+    # Each worker process renders its chunk of frames with its own copy of
+    # the figure, into a lossless segment.
+    fig = pickle.loads(fig_pickle)
+    axes = fig.axes[axes_index]
+    polygon = axes.patches[polygon_index]
+    return _write_movie(fig, axes, polygon, data, filename, fps, dpi, lossless=True)
+
+
+def _write_movie_parallel(fig, axes, polygon, data, filename, fps, dpi,
+                          progress, workers):
+    # The frames are split into consecutive chunks rendered in parallel into
+    # lossless (ffv1) segments. The segments are then decoded back to the
+    # raw RGBA frames, which are encoded once by the same encoder as in
+    # `_write_movie`: the movie is identical to the serial one.
+    n = len(data)
+    fig_pickle = pickle.dumps(fig)
+    axes_index = fig.axes.index(axes)
+    polygon_index = list(axes.patches).index(polygon)
+    chunks = [c for c in np.array_split(np.arange(n), workers) if len(c)]
+    with tempfile.TemporaryDirectory() as tmp:
+        segments = [os.path.join(tmp, f"{k}.mkv") for k in range(len(chunks))]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(
+                    _write_segment, fig_pickle, axes_index, polygon_index,
+                    _frames(data, chunk[0], chunk[-1] + 1), segment, fps, dpi,
+                ): chunk
+                for chunk, segment in zip(chunks, segments)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                size = future.result()
+                if progress:
+                    for i in futures[future]:
+                        progress(i, n)
+        playlist = os.path.join(tmp, "segments.txt")
+        with open(playlist, "w") as file:
+            for segment in segments:
+                file.write(f"file '{segment}'\n")
+        cmd = [
+            mpl.rcParams["animation.ffmpeg_path"],
+            "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", playlist,
+            "-fps_mode", "passthrough", "-f", "rawvideo", "-pix_fmt", "rgba", "-",
+        ]
+        decoder = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        try:
+            with _ffmpeg_pipe(filename, fps, size) as pipe:
+                for chunk in iter(lambda: decoder.stdout.read(1 << 20), b""):
+                    pipe.write(chunk)
+        finally:
+            decoder.stdout.close()
+            if decoder.wait() != 0:
+                raise subprocess.CalledProcessError(decoder.returncode, cmd)
+
+
+class _StoredFrames:
+    "Frames `start:stop` of a trajectory store, read lazily by a worker"
+
+    def __init__(self, filename, start, stop):
+        self.filename, self.start, self.stop = filename, start, stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __iter__(self):
+        data = load_data(self.filename)
+        for i in range(self.start, self.stop):
+            yield data[i]
+
+
+def _frames(data, start, stop):
+    "Frames sent to a worker (stores are reopened instead of copied)"
+    if isinstance(data, np.memmap) and data.filename and data.flags.c_contiguous:
+        if data.shape == load_data(data.filename).shape:  # the whole store
+            return _StoredFrames(data.filename, start, stop)
+    return data[start:stop]
+
+
+def _render_frames(fig, axes, polygon, data, dpi):
+    "Yield the RGBA buffers of the frames (valid until the next one)"
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+    canvas = fig.canvas
+    original_dpi = fig.dpi
+    fig.set_dpi(dpi)
+    try:
+        # When the polygon is drawn last anyway, render everything else once
+        # and blit the polygon over this background.
+        others = [a for a in axes.get_children() if a is not polygon]
+        blit = all(a.get_zorder() <= polygon.get_zorder() for a in others)
+        if blit:
+            polygon.set_visible(False)
+            canvas.draw()
+            background = canvas.copy_from_bbox(fig.bbox)
+            polygon.set_visible(True)
+        for x, y in data:
+            polygon.set_xy(np.column_stack((x, y)))
+            if blit:
+                canvas.restore_region(background)
+                axes.draw_artist(polygon)
+            else:
+                canvas.draw()
+            yield canvas.buffer_rgba()
+    finally:
+        fig.set_dpi(original_dpi)
+
+
+@contextlib.contextmanager
+def _ffmpeg_pipe(filename, fps, size, lossless=False):
+    """
+    Stream raw RGBA frames of the given size to an ffmpeg encoder (h264, or
+    the lossless ffv1 codec)
+    """
+    width, height = size
+    if lossless:  # bgra: same bytes as rgba, reordered
+        codec = ["-vcodec", "ffv1", "-pix_fmt", "bgra"]
+    else:  # h264 needs even dimensions: like FFMpegWriter, round them down
+        codec = [
+            "-vf", "crop=trunc(iw/2)*2:trunc(ih/2)*2",
+            "-vcodec", "h264", "-pix_fmt", "yuv420p",
+        ]
+    cmd = [
+        mpl.rcParams["animation.ffmpeg_path"],
+        "-loglevel", "error",
+        "-f", "rawvideo", "-vcodec", "rawvideo", "-pix_fmt", "rgba",
+        "-s", f"{width}x{height}", "-framerate", str(fps), "-i", "-",
+        *codec,
+        "-y", filename,
+    ]
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        yield process.stdin
+    finally:
+        process.stdin.close()
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
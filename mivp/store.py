@@ -0,0 +1,115 @@
+"""
+Sampled trajectories, in memory or in memory-mapped trajectory stores
+"""
+
+# Python Standard Library
+import os
+
+# Third-Party Libraries
+import numpy as np
+
+# Local Library
+from .batch import _SampleSolution
+
+# Trajectories of shape `(len(t), n, N)` stored in `.npy` files and accessed
+# through memory maps: they are written as they are computed and read lazily
+# (frame by frame) by `generate_movie`, without loading them in memory.
+_STORE_CHUNK = 1024  # samples written at once
+
+
+def get_data(results, t, filename=None, key=None):
+    """
+    Trajectories of the results sampled at times `t`, shape `(len(t), n, N)`
+    for `N` results of state dimension `n`.
+
+    With a `filename`, the data is written (sample by sample) to a
+    memory-mapped `.npy` trajectory store instead of memory, and the
+    read-only store is returned (see `open_store`).
+    """
+    n = np.shape(results[0].sol(t[0]))[0] if len(results) else 2
+    store = open_store(filename, (len(t), n, len(results)), key)
+    with store as data:
+        _sample(results, t, data)
+    return store.data
+
+
+def _sample(results, t, data):
+    sols = [r.sol for r in results]
+    if sols and all(isinstance(s, _SampleSolution) for s in sols):
+        batch = sols[0].batch
+        if all(s.batch is batch for s in sols):  # vectorized evaluation
+            samples = np.array([s.index for s in sols])
+            for start in range(0, len(samples), _STORE_CHUNK):
+                chunk = slice(start, start + _STORE_CHUNK)
+                data[:, :, chunk] = batch(t, samples[chunk])
+            return
+    for i, r in enumerate(results):
+        sol_t = r.sol(t)
+        data[:, :, i] = sol_t.T
+
+
+def load_data(filename):
+    "Open a trajectory store (read-only memory map)"
+    return np.load(filename, mmap_mode="r")
+
+
+def _key_file(filename):
+    return filename + ".key"
+
+
+def cached_data(filename, key):
+    """
+    Open the trajectory store `filename` if it was created with the same
+    `key` (any string describing the computation), else return `None`.
+    """
+    try:
+        with open(_key_file(filename)) as file:
+            if file.read() == key:
+                return load_data(filename)
+    except OSError:
+        pass
+    return None
+
+
+class open_store:
+    """
+    Context manager yielding a writable array of the given shape, in
+    memory (no `filename`) or in a new memory-mapped store.
+
+    The store is written to a temporary file, renamed on success; its
+    read-only memory map then replaces the array (attribute `data`).
+    """
+
+    def __init__(self, filename, shape, key=None):
+        self.filename, self.shape, self.key = filename, shape, key
+
+    def __enter__(self):
+        if self.filename is None:
+            self.data = np.zeros(self.shape)
+        else:
+            self.tmp = f"{self.filename}.{os.getpid()}.tmp"
+            self.data = np.lib.format.open_memmap(
+                self.tmp, mode="w+", dtype=np.float64, shape=self.shape
+            )
+        return self.data
+
+    def __exit__(self, type, value, traceback):
+        if self.filename is None:
+            return
+        self.data.flush()
+        self.data = None  # closes the memory map
+        if type is not None:
+            os.remove(self.tmp)
+            return
+        # The previous key goes first: a crash in between leaves a store
+        # without a key (a cache miss), never new data with an old key.
+        key_file = _key_file(self.filename)
+        if os.path.exists(key_file):
+            os.remove(key_file)
+        os.replace(self.tmp, self.filename)
+        if self.key is not None:
+            tmp = f"{key_file}.{os.getpid()}.tmp"
+            with open(tmp, "w") as file:
+                file.write(self.key)
+            os.replace(tmp, key_file)
+        self.data = load_data(self.filename)
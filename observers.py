@@ -0,0 +1,158 @@
+"""
+Observers: gains, batched simulation and Monte Carlo estimation error
+
+The plant is `dx/dt = A x + B u + v`, `y = C x + w` and the observer
+`dx_hat/dt = A x_hat + B u - L (C x_hat - y)`. The linear dynamics of the
+joint state `(x, x_hat)` are discretized once (see `lti`) and propagated
+for whole batches of initial states.
+
+The disturbances `v` and `w` are white noises of intensities `V` and `W`,
+approximated by piecewise constant values on the time steps (independent
+Gaussian samples of covariances `V / dt` and `W / dt`).
+"""
+
+# Third-Party Libraries
+import numpy as np
+import scipy.linalg as sla
+import scipy.signal as sig
+
+# Local Library
+import lti
+
+
+def observer_gain(A, C, poles):
+    "Gain `L` such that the eigenvalues of `A - L @ C` are `poles`"
+    return sig.place_poles(np.transpose(A), np.transpose(C), poles).gain_matrix.T
+
+
+def kalman_gain(A, C, Q, R):
+    "Kalman gain `L` for the weights `Q` and `R` (notations of the course)"
+    Sigma = sla.solve_continuous_are(
+        np.transpose(A), np.transpose(C), np.linalg.inv(Q), np.linalg.inv(R)
+    )
+    return Sigma @ np.transpose(C) @ R
+
+
+def augmented(A, B, C, L):
+    """
+    Matrices `(A_, B_)` of the joint dynamics `d(x, x_hat)/dt = A_ (x, x_hat) + B_ u`
+    """
+    A, B, C, L = (np.atleast_2d(M) for M in (A, B, C, L))
+    A_ = np.block([[A, np.zeros_like(A)], [L @ C, A - L @ C]])
+    B_ = np.concatenate([B, B])
+    return A_, B_
+
+
+def simulate(A, B, C, L, t, x0, x_hat0, u=None):
+    """
+    Plant and observer states at the times `t` (no disturbances).
+
+    The initial states `x0` and `x_hat0` have shape `(n,)` or `(n, N)` for
+    a batch (the other one may then be a single state); the result has
+    shape `(len(t), 2 * n)` or `(len(t), 2 * n, N)` (`x` then `x_hat`, as
+    the `X_Xhat` vector of the course).
+    """
+    A_, B_ = augmented(A, B, C, L)
+    x0, x_hat0 = np.asarray(x0, float), np.asarray(x_hat0, float)
+    if x0.ndim != x_hat0.ndim:  # a single state for the whole batch
+        x0, x_hat0 = (x.reshape(len(x), -1) for x in (x0, x_hat0))
+    x0, x_hat0 = np.broadcast_arrays(x0, x_hat0)
+    y0 = np.concatenate([x0, x_hat0])
+    if u is None:
+        return lti.simulate(A_, y0, t)
+    return lti.simulate(A_, y0, t, B=B_, u=u)
+
+
+def _error_steps(A, C, L, dt):
+    """
+    Discretization of the estimation error `e = x_hat - x`: the reduction of
+    the joint dynamics `de/dt = (A - L C) e - v + L w`, one step per `dt`.
+    """
+    A, C, L = (np.atleast_2d(M) for M in (A, C, L))
+    n, p = len(A), len(C)
+    G = np.concatenate([-np.eye(n), L], axis=1)  # disturbances (v, w)
+    steps = {}
+    for h in np.unique(dt):
+        steps[h] = lti.discretize(A - L @ C, G, h)
+    return steps, n, p
+
+
+def _noise_covariance(V, W, n, p, h):
+    "Covariance of the piecewise constant disturbances `(v, w)` on a step `h`"
+    Q = np.zeros((n + p, n + p))
+    if V is not None:
+        Q[:n, :n] = np.atleast_2d(V) / h
+    if W is not None:
+        Q[n:, n:] = np.atleast_2d(W) / h
+    return Q
+
+
+def _factor(P):
+    "Matrix `F` such that `F @ F.T == P` (`P` symmetric positive semi-definite)"
+    w, U = np.linalg.eigh(P)
+    return U * np.sqrt(np.maximum(w, 0.0))
+
+
+def error_covariance(A, C, L, t, P0, V=None, W=None):
+    """
+    Exact mean-square estimation error: covariance `P[k]` of `e(t[k])` when
+    `e(t[0])` is centered with covariance `P0` (shape `(len(t), n, n)`).
+    """
+    t = np.asarray(t, dtype=np.float64)
+    dt = np.diff(t)
+    steps, n, p = _error_steps(A, C, L, dt)
+    P = np.empty((len(t), n, n))
+    P[0] = P0
+    for k, h in enumerate(dt):
+        Phi, Gamma = steps[h]
+        Q = _noise_covariance(V, W, n, p, h)
+        P[k + 1] = Phi @ P[k] @ Phi.T + Gamma @ Q @ Gamma.T
+    return P
+
+
+def error_statistics(
+    A, C, L, t, P0, n_samples, V=None, W=None, seed=None, chunk_size=10000
+):
+    """
+    Monte Carlo estimation of the mean and covariance of the estimation error
+    `e = x_hat - x` at the times `t`, for `n_samples` initial errors drawn
+    from a centered Gaussian of covariance `P0`.
+
+    The samples are propagated in chunks of `chunk_size` trajectories and
+    only the statistics are kept: memory use is `O(len(t) * n * n)`,
+    regardless of the number of samples.
+
+    Return the arrays `mean` (shape `(len(t), n)`) and `covariance`
+    (shape `(len(t), n, n)`).
+    """
+    t = np.asarray(t, dtype=np.float64)
+    dt = np.diff(t)
+    steps, n, p = _error_steps(A, C, L, dt)
+    noisy = V is not None or W is not None
+    noise = {h: _factor(_noise_covariance(V, W, n, p, h)) for h in steps}
+    P0_factor = _factor(np.atleast_2d(P0))
+    rng = np.random.default_rng(seed)
+
+    count = 0
+    mean = np.zeros((len(t), n))
+    M2 = np.zeros((len(t), n, n))  # sum of the squared deviations
+    for start in range(0, n_samples, chunk_size):
+        N = min(chunk_size, n_samples - start)
+        e = P0_factor @ rng.standard_normal((n, N))
+        for k in range(len(t)):
+            if k > 0:
+                h = dt[k - 1]
+                Phi, Gamma = steps[h]
+                e = Phi @ e
+                if noisy:
+                    e += Gamma @ (noise[h] @ rng.standard_normal((n + p, N)))
+            # Merge the chunk statistics (Chan et al. parallel algorithm)
+            chunk_mean = e.mean(axis=1)
+            deviation = e - chunk_mean[:, np.newaxis]
+            delta = chunk_mean - mean[k]
+            total = count + N
+            mean[k] += delta * (N / total)
+            M2[k] += deviation @ deviation.T + np.outer(delta, delta) * (count * N / total)
+        count += N
+
+    return mean, M2 / max(count - 1, 1)
@@ -0,0 +1,136 @@
+"""
+Input-output behavior of linear systems: transfer functions, impulse and
+step responses, convolutions (numerical, vectorized counterparts of the
+symbolic computations of the IO behavior chapter)
+"""
+
+# Third-Party Libraries
+import numpy as np
+import scipy.fft
+import scipy.linalg as sla
+
+# Local Library
+import lti
+
+
+def _matrices(A, B, C, D):
+    A, B, C = np.atleast_2d(A), np.atleast_2d(B), np.atleast_2d(C)
+    D = np.zeros((len(C), B.shape[1])) if D is None else np.atleast_2d(D)
+    return A, B, C, D
+
+
+def frequency_response(A, B, C, D=None, s=None, method="hessenberg", chunk_size=4096):
+    """
+    Transfer function `H(s) = C (sI - A)^{-1} B + D` evaluated at every
+    (complex) point of `s`; the result has shape `(len(s), p, m)`.
+
+    `A` is reduced once, then the values of `H` are computed for whole
+    chunks of `s` at once:
+
+      - `"hessenberg"`: `A = U H U^*` with `H` upper Hessenberg; the
+        systems `(sI - H) X = U^* B` are solved by a vectorized elimination
+        (`O(n^2)` operations per point),
+
+      - `"eig"`: `A = V diag(λ) V^{-1}`, then `H(s) = C V diag(1 / (s - λ))
+        V^{-1} B + D` (`O(n)` operations per point; diagonalizable and
+        well-conditioned `A` only).
+
+    Use `s = 1j * omega` for the frequency response (Bode plots).
+    """
+    A, B, C, D = _matrices(A, B, C, D)
+    s = np.atleast_1d(np.asarray(s, dtype=np.complex128))
+    out = np.empty((len(s),) + D.shape, dtype=np.complex128)
+
+    if method == "eig":
+        eigenvalues, V = np.linalg.eig(A)
+        if np.linalg.cond(V) > 1e8:
+            raise ValueError("A is not (numerically) diagonalizable, use 'hessenberg'")
+        CV, VB = C @ V, np.linalg.solve(V, B)
+        for start in range(0, len(s), chunk_size):
+            s_ = s[start : start + chunk_size]
+            inverse = 1.0 / (s_[:, np.newaxis] - eigenvalues)  # (k, n)
+            out[start : start + len(s_)] = (CV * inverse[:, np.newaxis, :]) @ VB + D
+        return out
+    elif method != "hessenberg":
+        raise ValueError(f"unknown method {method!r}")
+
+    H, U = sla.hessenberg(A, calc_q=True)
+    CU, UB = C @ U, U.conj().T @ B
+    for start in range(0, len(s), chunk_size):
+        s_ = s[start : start + chunk_size]
+        X = _hessenberg_solve(H, s_, UB)
+        out[start : start + len(s_)] = CU @ X + D
+    return out
+
+
+def _hessenberg_solve(H, s, rhs):
+    """
+    Solutions `X[k]` of `(s[k] I - H) X[k] = rhs` for an upper Hessenberg
+    matrix `H` (Gaussian elimination with partial pivoting, vectorized over `s`)
+    """
+    n = len(H)
+    M = np.multiply.outer(s, np.eye(n)) - H  # (k, n, n)
+    X = np.array(np.broadcast_to(rhs, (len(s),) + rhs.shape), dtype=np.complex128)
+    for i in range(n - 1):
+        # Only the rows i and i + 1 are involved (single subdiagonal entry)
+        swap = np.abs(M[:, i + 1, i]) > np.abs(M[:, i, i])
+        rows = M[swap, i : i + 2, i:]
+        M[swap, i : i + 2, i:] = rows[:, ::-1]
+        rows = X[swap, i : i + 2]
+        X[swap, i : i + 2] = rows[:, ::-1]
+        factor = M[:, i + 1, i] / M[:, i, i]
+        M[:, i + 1, i:] -= factor[:, np.newaxis] * M[:, i, i:]
+        X[:, i + 1] -= factor[:, np.newaxis] * X[:, i]
+    for i in range(n - 1, -1, -1):  # back substitution
+        X[:, i] -= np.einsum("kj,kjm->km", M[:, i, i + 1 :], X[:, i + 1 :])
+        X[:, i] /= M[:, i, i, np.newaxis]
+    return X
+
+
+def impulse_response(A, B, C, t):
+    """
+    Impulse response `H(t) = C exp(A t) B` at the times `t`, shape
+    `(len(t), p, m)` (the `D δ(t)` term is not represented).
+    """
+    A, B, C, _ = _matrices(A, B, C, None)
+    t = np.asarray(t, dtype=np.float64)
+    return C @ lti.simulate(A, B, t) if t[0] == 0.0 else C @ lti.expm_grid(A, t) @ B
+
+
+def step_response(A, B, C, D=None, t=None):
+    """
+    Output for a unit step on each input, from a zero initial state:
+    `Y[k, :, j]` is the output at time `t[k]` when `u_j(t) = 1` for
+    `t >= t[0]` (shape `(len(t), p, m)`; exact for any time grid).
+    """
+    A, B, C, D = _matrices(A, B, C, D)
+    t = np.asarray(t, dtype=np.float64)
+    n, m = B.shape
+    # Constant inputs are extra states: d(x, u)/dt = (A x + B u, 0)
+    M = np.zeros((n + m, n + m))
+    M[:n, :n], M[:n, n:] = A, B
+    xu0 = np.concatenate([np.zeros((n, m)), np.eye(m)])  # one input per column
+    x = lti.simulate(M, xu0, t)[:, :n]
+    return C @ x + D
+
+
+def convolve(h, u, dt):
+    """
+    Samples of the convolution `y = h * u` of causal signals sampled with
+    the time step `dt` from `t = 0`: `y(t) = ∫_0^t h(t - τ) u(τ) dτ`
+    (rectangle rule), computed with FFTs in `O(N log N)` operations.
+
+    Scalar signals are 1d arrays; for systems with several inputs and
+    outputs, `h` has shape `(N, p, m)`, `u` shape `(N, m)` and `y` shape
+    `(N, p)`.
+    """
+    h, u = np.asarray(h), np.asarray(u)
+    N = len(u)
+    size = scipy.fft.next_fast_len(len(h) + N - 1, real=True)
+    h_hat = scipy.fft.rfft(h, size, axis=0)
+    u_hat = scipy.fft.rfft(u, size, axis=0)
+    if h.ndim == 1:
+        y_hat = h_hat * u_hat
+    else:
+        y_hat = np.einsum("fpm,fm->fp", h_hat, u_hat)
+    return scipy.fft.irfft(y_hat, size, axis=0)[:N] * dt
@@ -0,0 +1,187 @@
+"""
+Gain sweeps: batches of pole placement or LQR designs and their metrics
+
+The designs of a sweep are described by arrays (one row per design) and
+the results are stored in a single structured array with the fields:
+
+  - `K`: the gain matrix (`u = -K x`),
+
+  - `eigenvalues`: the spectrum of `A - B @ K`,
+
+  - `abscissa`: the largest real part of these eigenvalues,
+
+  - `cost`: `trace(P)`, the average of the quadratic cost
+    `x0.T @ P @ x0 = ∫ x.T Q x + u.T R u dt` over unit-variance
+    initial states (`inf` if the closed loop is unstable).
+
+Identical designs are only computed once; designs that share a system
+`(A, B)` are sent together (with a single copy of `A` and `B`) to the
+workers when the sweep runs in a process pool.
+"""
+
+# Python Standard Library
+import concurrent.futures
+
+# Third-Party Libraries
+import numpy as np
+import scipy.linalg as sla
+import scipy.signal as sig
+
+
+def result_dtype(n, m):
+    "Structured dtype of the results of a sweep with `n` states and `m` inputs"
+    return np.dtype(
+        [
+            ("K", np.float64, (m, n)),
+            ("eigenvalues", np.complex128, (n,)),
+            ("abscissa", np.float64),
+            ("cost", np.float64),
+        ]
+    )
+
+
+def _metrics(A, B, K, Q, R):
+    A_cl = A - B @ K
+    eigenvalues = np.linalg.eigvals(A_cl)
+    eigenvalues = eigenvalues[np.lexsort((eigenvalues.imag, eigenvalues.real))]
+    abscissa = np.amax(eigenvalues.real)
+    if abscissa < 0.0:
+        P = sla.solve_continuous_lyapunov(A_cl.T, -(Q + K.T @ R @ K))
+        cost = np.trace(P)
+    else:
+        cost = np.inf
+    return K, eigenvalues, abscissa, cost
+
+
+def _lqr_chunk(A, B, params):
+    results = []
+    for Q, R in params:
+        Pi = sla.solve_continuous_are(A, B, Q, R)
+        K = np.linalg.solve(R, B.T @ Pi)
+        results.append(_metrics(A, B, K, Q, R))
+    return results
+
+
+def _stack(array, k, shape):
+    "Array of `k` items of the given shape (a single item is repeated)"
+    array = np.asarray(array, dtype=np.float64)
+    if array.shape == shape:
+        array = np.broadcast_to(array, (k,) + shape)
+    if array.shape != (k,) + shape:
+        raise ValueError(f"expected shape {shape} or {(k,) + shape}, got {array.shape}")
+    return array
+
+
+def _batch_size(**arrays):
+    """
+    Number of designs: the common length of the arrays that have a leading
+    batch axis (given as `name=(array, item_ndim)`), 1 if there are none
+    """
+    sizes = {
+        name: len(array) for name, (array, ndim) in arrays.items()
+        if np.ndim(array) == ndim + 1
+    }
+    if len(set(sizes.values())) > 1:
+        raise ValueError(f"inconsistent numbers of designs: {sizes}")
+    return max(sizes.values(), default=1)
+
+
+def _key(*arrays):
+    return b"".join(np.ascontiguousarray(array).tobytes() for array in arrays)
+
+
+def _run(A, B, items, chunk, executor, chunk_size):
+    """
+    Group the design parameters `items` by system (A, B), drop duplicates,
+    evaluate `chunk(A_, B_, params)` on chunks of each group and return
+    the results in the order of `items`.
+    """
+    k, n, m = len(items), A.shape[-1], B.shape[-1]
+    groups = {}  # system key -> (A_, B_, {params key: params})
+    index = []  # (system key, params key) of each design
+    for i, params in enumerate(items):
+        system = _key(A[i], B[i])
+        group = groups.setdefault(system, (A[i], B[i], {}))
+        key = _key(*params)
+        group[2].setdefault(key, params)
+        index.append((system, key))
+
+    jobs = []
+    for system, (A_, B_, unique) in groups.items():
+        keys, params = list(unique.keys()), list(unique.values())
+        for start in range(0, len(keys), chunk_size):
+            stop = start + chunk_size
+            jobs.append((system, keys[start:stop], (A_, B_, params[start:stop])))
+
+    if executor is None:
+        outputs = [chunk(*args) for _, _, args in jobs]
+    else:
+        futures = [executor.submit(chunk, *args) for _, _, args in jobs]
+        outputs = [future.result() for future in futures]
+
+    results = {}
+    for (system, keys, _), output in zip(jobs, outputs):
+        for key, result in zip(keys, output):
+            results[system, key] = result
+
+    out = np.empty(k, dtype=result_dtype(n, m))
+    for i, ij in enumerate(index):
+        out[i] = results[ij]
+    return out
+
+
+class _PlaceChunk:  # picklable, unlike a closure
+    def __init__(self, Q, R):
+        self.Q, self.R = Q, R
+
+    def __call__(self, A, B, params):
+        results = []
+        for (poles,) in params:
+            K = sig.place_poles(A, B, poles).gain_matrix
+            results.append(_metrics(A, B, K, self.Q, self.R))
+        return results
+
+
+def place(A, B, poles, Q=None, R=None, executor=None, workers=None, chunk_size=64):
+    """
+    Pole placement sweep: one design per row of `poles` (shape `(k, n)`).
+
+    `A`, `B` and `poles` are either shared by all designs or given per
+    design (shapes `(k, n, n)`, `(k, n, m)` and `(k, n)`). The cost is
+    measured with the weights `Q` and `R` (identity matrices by default).
+    """
+    if executor is None and workers is not None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return place(A, B, poles, Q, R, executor, None, chunk_size)
+    poles = np.asarray(poles)
+    n = poles.shape[-1]
+    k = _batch_size(A=(A, 2), B=(B, 2), poles=(poles, 1))
+    poles = np.broadcast_to(poles, (k, n))
+    A = _stack(A, k, (n, n))
+    m = np.shape(B)[-1]
+    B = _stack(B, k, (n, m))
+    Q = np.eye(n) if Q is None else np.asarray(Q, dtype=np.float64)
+    R = np.eye(m) if R is None else np.asarray(R, dtype=np.float64)
+
+    items = [(p,) for p in poles]
+    return _run(A, B, items, _PlaceChunk(Q, R), executor, chunk_size)
+
+
+def lqr(A, B, Q, R, executor=None, workers=None, chunk_size=64):
+    """
+    LQR sweep: one design per pair of weights `(Q[i], R[i])` (shapes
+    `(k, n, n)` and `(k, m, m)`; a single `Q` or `R` is shared by all
+    designs).
+
+    `A` and `B` are either shared by all designs or given per design.
+    """
+    if executor is None and workers is not None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return lqr(A, B, Q, R, executor, None, chunk_size)
+    n, m = np.shape(B)[-2:]
+    Q, R = np.asarray(Q, dtype=np.float64), np.asarray(R, dtype=np.float64)
+    k = _batch_size(A=(A, 2), B=(B, 2), Q=(Q, 2), R=(R, 2))
+    Q, R = _stack(Q, k, (n, n)), _stack(R, k, (m, m))
+    A, B = _stack(A, k, (n, n)), _stack(B, k, (n, m))
+    items = list(zip(Q, R))
+    return _run(A, B, items, _lqr_chunk, executor, chunk_size)
@@ -0,0 +1,111 @@
+"""
+Memoized symbolic computations: sympy transforms and lambdify compilation
+
+Results are keyed by the structure of the expressions (`sympy.srepr`), not
+by their identity, and kept in memory and on disk (in `$BUILD_CACHE/symbolic`,
+`.build-cache/symbolic` by default), so that the same transforms and
+compilations are free across chapters and builds.
+"""
+
+# Python Standard Library
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+
+# Third-Party Libraries
+import sympy
+from sympy.core.function import AppliedUndef
+
+CACHE_DIR = os.path.join(os.environ.get("BUILD_CACHE", ".build-cache"), "symbolic")
+
+_results = {}  # key -> transform result
+_functions = {}  # key -> compiled function
+
+
+def structural_hash(*objects):
+    "Hash of the structure of sympy expressions (and plain Python values)"
+    digest = hashlib.sha256(sympy.__version__.encode("utf-8"))
+    for object in objects:
+        digest.update(b"\0" + sympy.srepr(object).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _load(kind, key):
+    try:
+        with open(os.path.join(CACHE_DIR, kind, key), "rb") as file:
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def _store(kind, key, value):
+    "Atomic write (concurrent builds may share the cache)"
+    try:
+        path = os.path.join(CACHE_DIR, kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as file:
+            pickle.dump(value, file)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        pass  # the cache is an optimization only
+
+
+def memoize(transform):
+    """
+    Memoize a symbolic transform (such as `laplace_transform`): calls with
+    structurally identical arguments return the stored result.
+
+    Usage: `laplace_transform = memoize(laplace_transform)`
+    """
+    name = f"{transform.__module__}.{transform.__qualname__}"
+
+    @functools.wraps(transform)
+    def memoized(*args, **kwargs):
+        key = structural_hash(name, args, sorted(kwargs.items()))
+        if key not in _results:
+            result = _load("results", key)
+            if result is None:
+                result = transform(*args, **kwargs)
+                _store("results", key, result)
+            _results[key] = result
+        return _results[key]
+
+    return memoized
+
+
+def lambdify(args, expr, modules="numpy", **options):
+    """
+    Memoized `sympy.lambdify`: vectorized numerical function of the
+    expression `expr`, with arguments `args`.
+
+    The generated source code is also stored on disk, unless the
+    expression contains user-defined functions (whose implementation
+    cannot be stored).
+    """
+    key = structural_hash(args, expr, modules, sorted(options.items()))
+    if key in _functions:
+        return _functions[key]
+
+    storable = isinstance(modules, str) and not expr_atoms(expr, AppliedUndef)
+    source = _load("functions", key) if storable else None
+    if source is not None:
+        # Same namespace as the one lambdify generates for these modules
+        namespace = dict(sympy.lambdify([], 0, modules=modules).__globals__)
+        exec(source, namespace)
+        function = namespace["_lambdifygenerated"]
+    else:
+        function = sympy.lambdify(args, expr, modules=modules, **options)
+        if storable:
+            _store("functions", key, inspect.getsource(function))
+    _functions[key] = function
+    return function
+
+
+def expr_atoms(expr, *types):
+    "Atoms of the given types in `expr` (or in the items of a container)"
+    if isinstance(expr, (list, tuple)):
+        return set().union(*(expr_atoms(item, *types) for item in expr))
+    return sympy.sympify(expr).atoms(*types)
@@ -0,0 +1,55 @@
+# Python Standard Library
+import concurrent.futures
+
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+
+# Local Library
+import basins
+
+
+def damped_pendulum(t, y):  # y has shape (2,) or (2, m)
+    theta, omega = y
+    return np.array([omega, -np.sin(theta) - 0.5 * omega])
+
+
+def test_classify_matches_solve_ivp():
+    # Reference: the state of solve_ivp at t_max, away from the radii
+    y0s = np.array([[1.0, 0.0], [3.0, 1.5], [-2.5, -2.0], [0.5, 3.5]])
+    labels = basins.classify(damped_pendulum, y0s, [0.0, 0.0], 0.1, 30.0)
+    for y0, label in zip(y0s, labels):
+        result = sci.solve_ivp(damped_pendulum, (0.0, 30.0), y0, rtol=1e-9, atol=1e-12)
+        r = np.linalg.norm(result.y[:, -1])
+        assert label == (basins.CONVERGED if r <= 0.1 else basins.UNDECIDED)
+    assert labels[0] == basins.CONVERGED and labels[1] == basins.UNDECIDED
+
+
+def test_raster_refinement():
+    # The refined raster agrees with the full grid, up to a few boundary points
+    xs, ys = np.linspace(-4.0, 4.0, 33), np.linspace(-3.0, 3.0, 25)
+    X, Y = np.meshgrid(xs, ys)
+    full = basins.classify(
+        damped_pendulum, np.c_[X.ravel(), Y.ravel()], [0.0, 0.0], 0.1, 20.0
+    ).reshape(X.shape)
+    labels = basins.raster(damped_pendulum, xs, ys, [0.0, 0.0], 0.1, 20.0, levels=2)
+    assert labels.shape == (len(ys), len(xs))
+    assert np.mean(labels != full) < 0.02
+
+
+def test_raster_single_pool(monkeypatch):
+    pools = []
+
+    class Pool(concurrent.futures.ThreadPoolExecutor):
+        def __init__(self, max_workers=None):
+            super().__init__(max_workers=max_workers)
+            pools.append(self)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", Pool)
+    xs, ys = np.linspace(-4.0, 4.0, 17), np.linspace(-3.0, 3.0, 13)
+    labels = basins.raster(
+        damped_pendulum, xs, ys, [0.0, 0.0], 0.1, 20.0, levels=2, workers=2, chunk_size=16
+    )
+    assert len(pools) == 1
+    expected = basins.raster(damped_pendulum, xs, ys, [0.0, 0.0], 0.1, 20.0, levels=2)
+    assert np.array_equal(labels, expected)
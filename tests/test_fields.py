@@ -0,0 +1,51 @@
+# Third-Party Libraries
+import numpy as np
+import pytest
+
+# Local Library
+import fields
+
+
+def chapters_Q(f, xs, ys):  # the Q helper of the chapters
+    X, Y = np.meshgrid(xs, ys)
+    fx = np.vectorize(lambda x, y: f([x, y])[0])
+    fy = np.vectorize(lambda x, y: f([x, y])[1])
+    return X, Y, fx(X, Y), fy(X, Y)
+
+
+A = np.array([[0.0, 1.0], [-2.0, -0.5]])
+
+
+def pendulum(xy):  # array-aware
+    theta, omega = xy
+    return (omega, -np.sin(theta))
+
+
+def linear(xy):  # 1d arrays only
+    return A @ xy
+
+
+def scalar(xy):  # scalars only
+    x, y = xy
+    return [float(y), -x - (y if y > 0 else 0.0)]
+
+
+def constant(xy):  # components that do not depend on the point
+    return (1.0, 0.0)
+
+
+@pytest.mark.parametrize("f", [pendulum, linear, scalar, constant])
+def test_Q_matches_chapters_helper(f):
+    xs, ys = np.linspace(-3.0, 3.0, 31), np.linspace(-2.0, 2.0, 21)
+    found = fields.Q(f, xs, ys)
+    expected = chapters_Q(f, xs, ys)
+    for a, b in zip(found, expected):
+        assert a.shape == b.shape
+        assert np.allclose(a, b, rtol=1e-15, atol=0.0)
+
+
+def test_evaluate_chunks():
+    X, Y = np.meshgrid(np.linspace(-1.0, 1.0, 50), np.linspace(-1.0, 1.0, 40))
+    U, V = fields.evaluate(linear, X, Y, chunk_size=7)
+    assert np.allclose(U, A[0, 0] * X + A[0, 1] * Y, rtol=1e-15, atol=1e-15)
+    assert np.allclose(V, A[1, 0] * X + A[1, 1] * Y, rtol=1e-15, atol=1e-15)
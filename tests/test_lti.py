@@ -0,0 +1,77 @@
+# Third-Party Libraries
+import numpy as np
+import pytest
+import scipy.integrate as sci
+import scipy.linalg as sla
+import scipy.signal as sig
+
+# Local Library
+import lti
+
+A = np.array([[0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [-1.0, -2.0, -1.5]])
+B = np.array([[0.0], [0.0], [1.0]])
+y0s = np.array([[1.0, 0.0, -1.0], [0.5, 2.0, 0.0]]).T  # (3, 2)
+
+
+def grids():
+    uniform = np.linspace(0.0, 10.0, 201)
+    rng = np.random.default_rng(0)
+    nonuniform = np.r_[0.0, np.cumsum(rng.choice([0.05, 0.1, 0.02], 150))]
+    return [uniform, nonuniform, uniform + 1.0]
+
+
+@pytest.mark.parametrize("t", grids())
+def test_expm_grid(t):
+    expected = np.array([sla.expm(A * t_) for t_ in t])
+    assert np.abs(lti.expm_grid(A, t) - expected).max() < 5e-13
+
+
+@pytest.mark.parametrize("method", ["expm", "eig"])
+@pytest.mark.parametrize("t", grids()[:2])
+def test_simulate(t, method):
+    expected = np.array([sla.expm(A * t_) for t_ in t]) @ y0s
+    yt = lti.simulate(A, y0s, t, method=method)
+    assert yt.shape == (len(t), 3, 2)
+    assert np.abs(yt - expected).max() < 5e-13
+    assert np.abs(lti.simulate(A, y0s[:, 0], t, method=method) - expected[..., 0]).max() < 5e-13
+
+
+def test_simulate_inputs():
+    # Zero-order hold between samples, as lsim with interp=False
+    t = grids()[0]
+    u = np.sin(t)[:, np.newaxis]
+    C, D = np.eye(3), np.zeros((3, 1))
+    _, _, expected = sig.lsim((A, B, C, D), u, t, X0=y0s[:, 0], interp=False)
+    yt = lti.simulate(A, y0s[:, 0], t, B=B, u=u)
+    assert np.abs(yt - expected).max() < 1e-14
+    # One input per initial state
+    us = np.stack([u, 2.0 * u], axis=-1)  # (len(t), 1, 2)
+    yts = lti.simulate(A, y0s, t, B=B, u=us)
+    _, _, expected = sig.lsim((A, B, C, D), 2.0 * u, t, X0=y0s[:, 1], interp=False)
+    assert np.abs(yts[..., 1] - expected).max() < 1e-14
+    # Time invariance (lsim starts from X0 at t = 0, not at t[0])
+    assert np.abs(lti.simulate(A, y0s[:, 0], t + 1.0, B=B, u=u) - yt).max() < 1e-14
+
+
+def test_simulate_inputs_nonuniform():
+    # Reference: solve_ivp on each interval, with the input held constant
+    t = grids()[1][:40]
+    u = np.cos(3.0 * t)[:, np.newaxis]
+    expected = [y0s[:, 0]]
+    for k in range(len(t) - 1):
+        result = sci.solve_ivp(
+            lambda t_, y: A @ y + B @ u[k], t[k : k + 2], expected[-1], rtol=1e-12, atol=1e-14
+        )
+        expected.append(result.y[:, -1])
+    yt = lti.simulate(A, y0s[:, 0], t, B=B, u=u)
+    assert np.abs(yt - expected).max() < 1e-10
+
+
+def test_simulate_errors():
+    t = np.linspace(0.0, 1.0, 11)
+    with pytest.raises(ValueError):
+        lti.simulate(A, y0s, t, u=np.zeros((11, 1)))
+    with pytest.raises(ValueError):
+        lti.simulate(A, y0s, t, B=B, u=np.zeros((11, 1)), method="eig")
+    with pytest.raises(ValueError):
+        lti.simulate(np.array([[0.0, 1.0], [0.0, 0.0]]), [1.0, 0.0], t, method="eig")
@@ -0,0 +1,53 @@
+# Third-Party Libraries
+import autograd.numpy as anp
+import numpy as np
+import scipy.linalg as sla
+
+# Local Library
+import lyapunov
+
+A = np.array([[0.0, 1.0], [-1.0, -0.5]])  # linearized damped pendulum
+Pi = sla.solve_continuous_lyapunov(A.T, -np.eye(2))  # A^t Pi + Pi A = -I
+
+
+def pendulum(x):
+    return anp.array([x[1], -anp.sin(x[0]) - 0.5 * x[1]])
+
+
+def test_evaluate_quadratic():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-2.0, 2.0, (2, 1000))
+    x_eq = np.array([[0.5], [0.0]])
+    V = lyapunov.quadratic(Pi, equilibrium=x_eq)
+    values, derivatives = lyapunov.evaluate(V, lambda x: A @ (x - x_eq), x + x_eq, chunk_size=64)
+    assert np.allclose(values, np.einsum("in,ij,jn->n", x, Pi, x), rtol=1e-14, atol=1e-15)
+    assert np.allclose(derivatives, -np.sum(x * x, axis=0), rtol=1e-13, atol=1e-14)
+
+
+def test_grid():
+    shape = (7, 5)
+    chunks = list(lyapunov.grid([-1.0, 0.0], [1.0, 2.0], shape, chunk_size=4))
+    x = np.concatenate([x for x, _ in chunks], axis=1)
+    boundary = np.concatenate([b for _, b in chunks])
+    X, Y = np.meshgrid(np.linspace(-1.0, 1.0, 7), np.linspace(0.0, 2.0, 5), indexing="ij")
+    assert np.array_equal(x, [X.ravel(), Y.ravel()])
+    inner = np.zeros(shape, dtype=bool)
+    inner[1:-1, 1:-1] = True
+    assert np.array_equal(boundary, ~inner.ravel())
+
+
+def test_certify_grid():
+    # Reference: the whole grid at once, closed-form derivative of V
+    V = lyapunov.quadratic(Pi)
+    low, high, shape = [-3.0, -3.0], [3.0, 3.0], (61, 41)
+    level = lyapunov.certify_grid(
+        V, pendulum, low, high, shape, equilibrium=[0.0, 0.0], radius=0.05, chunk_size=97
+    )
+    X, Y = np.meshgrid(np.linspace(-3.0, 3.0, 61), np.linspace(-3.0, 3.0, 41), indexing="ij")
+    x = np.array([X.ravel(), Y.ravel()])
+    values = np.einsum("in,ij,jn->n", x, Pi, x)
+    derivatives = np.sum(2.0 * (Pi @ x) * np.array(pendulum(x)), axis=0)
+    bad = (derivatives >= 0.0) & (np.linalg.norm(x, axis=0) > 0.05)
+    bad |= (np.abs(X) == 3.0).ravel() | (np.abs(Y) == 3.0).ravel()
+    assert np.isclose(level, np.min(values[bad]), rtol=1e-14, atol=0.0)
+    assert 0.0 < level < np.inf
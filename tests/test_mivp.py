@@ -0,0 +1,152 @@
+# Python Standard Library
+import os
+
+# Third-Party Libraries
+import numpy as np
+import pytest
+
+# Local Library
+import mivp
+
+
+def rotation_3d(t, y):  # rotation about the third axis; y has shape (3,) or (3, m)
+    return np.array([-y[1], y[0], 0.0 * y[2]])
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_get_data_state_dimension(batch, tmp_path):
+    y0s = [[1.0, 0.0, 1.0], [0.0, 2.0, -1.0]]
+    t = np.linspace(0.0, np.pi, 11)
+    results = mivp.solve(
+        fun=rotation_3d, t_span=(0.0, np.pi), y0s=y0s, batch=batch, rtol=1e-9, atol=1e-12
+    )
+    expected = np.array([
+        [np.cos(t), np.sin(t), np.ones_like(t)],
+        [-2.0 * np.sin(t), 2.0 * np.cos(t), -np.ones_like(t)],
+    ]).transpose(2, 1, 0)
+    data = mivp.get_data(results, t)
+    assert data.shape == (len(t), 3, 2)
+    assert np.allclose(data, expected, atol=1e-6)
+    stored = mivp.get_data(results, t, filename=str(tmp_path / "data.npy"))
+    assert np.array_equal(stored, data)
+
+
+def rotation(t, y):
+    return np.array([-y[1], y[0]])
+
+
+def test_batch_dense_output():
+    # Same continuous extension as solve_ivp: similar interpolation errors
+    t = np.linspace(0.0, 10.0, 2001)
+    y0s = [[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]]
+    results = mivp.solve_batch(rotation, (0.0, 10.0), y0s, rtol=1e-6, atol=1e-12)
+    for result, (x0, v0) in zip(results, y0s):
+        exact = [x0 * np.cos(t) - v0 * np.sin(t), x0 * np.sin(t) + v0 * np.cos(t)]
+        assert np.abs(result.sol(t) - exact).max() < 5e-6
+
+
+def test_batch_failed_sample():
+    # dy/dt = y^2 escapes to infinity at t = 1 from y = 1
+    results = mivp.solve_batch(
+        lambda t, y: y * y, (0.0, 2.0), [[1.0], [-1.0]], rtol=1e-6, atol=1e-9
+    )
+    assert results[0].status == -1 and not results[0].success
+    assert 0.999 < results[0].t_stop <= 1.0 + 1e-3
+    assert results[1].status == 0
+    assert abs(results[1].sol(2.0)[0] + 1.0 / 3.0) < 1e-5
+
+
+@pytest.mark.parametrize("t_span", [(0.0, 10.0), (10.0, 0.0)])
+def test_solve_fixed_endpoint(t_span):
+    # 1000 steps, 1000 % 7 != 0: the final state is stored all the same
+    t, y = mivp.solve_fixed(rotation, t_span, [[1.0, 0.0], [0.0, 1.0]], 1e-2, decimation=7)
+    assert len(t) == 1000 // 7 + 2 and t[0] == t_span[0] and t[-1] == t_span[1]
+    assert np.allclose(np.diff(t[:-1]), np.diff(t)[0])
+    s = t - t_span[0]
+    assert np.allclose(y[:, 0], [np.cos(s), np.sin(s)], atol=1e-8)
+    assert np.allclose(y[:, 1], [-np.sin(s), np.cos(s)], atol=1e-8)
+
+
+def test_solve_fixed_step():
+    with pytest.raises(ValueError):
+        mivp.solve_fixed(rotation, (0.0, 1.0), [1.0, 0.0], -0.1)
+
+
+def test_store_key(tmp_path, monkeypatch):
+    filename = str(tmp_path / "data.npy")
+    with mivp.open_store(filename, (3, 2, 1), key="first") as data:
+        data[:] = 1.0
+    assert np.all(mivp.cached_data(filename, "first") == 1.0)
+    assert mivp.cached_data(filename, "second") is None
+
+    # Crash right after the new data is in place: the old key is gone
+    replace = os.replace
+
+    def crash(src, dst):
+        replace(src, dst)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        with mivp.open_store(filename, (3, 2, 1), key="second") as data:
+            data[:] = 2.0
+    monkeypatch.undo()
+    assert mivp.cached_data(filename, "first") is None
+    assert mivp.cached_data(filename, "second") is None
+
+
+def test_batch_t_eval():
+    # Interpolated during the integration: same values as the dense output
+    def damped(t, y):
+        return np.array([y[1], -np.sin(y[0]) - 0.3 * y[1]])
+
+    y0s = np.random.default_rng(0).uniform(-3.0, 3.0, (50, 2))
+    t_eval = np.linspace(0.0, 20.0, 41)
+    options = dict(rtol=1e-6, atol=1e-9, mask=lambda t, y: np.hypot(*y) < 0.2)
+    results = mivp.solve_batch(damped, (0.0, 20.0), y0s, t_eval=t_eval, **options)
+    assert results[0].sol is None
+    dense = mivp.solve_batch(damped, (0.0, 20.0), y0s, **options)
+    assert any(r.status == 1 for r in dense)  # some samples are frozen
+    for result, reference in zip(results, dense):
+        assert np.allclose(result.y, reference.sol(t_eval), rtol=0.0, atol=1e-12)
+
+
+def van_der_pol(t, y, mu):
+    return np.array([y[1], mu * (1.0 - y[0] ** 2) * y[1] - y[0]])
+
+
+@pytest.mark.parametrize("method", ["RK45", "DOP853"])
+@pytest.mark.parametrize("t_eval", [np.linspace(0.0, 10.0, 101), np.linspace(10.0, 0.0, 51)])
+def test_stream(t_eval, method):
+    # Same steps and interpolants as solve_ivp with a dense output
+    y0s = [[2.0, 0.0], [0.5, -1.0], [0.0, 0.1]]
+    options = dict(fun=van_der_pol, args=(1.5,), method=method, rtol=1e-8, atol=1e-10)
+    t_span = (t_eval[0], t_eval[-1])
+    expected = mivp.get_data(mivp.solve(t_span=t_span, y0s=y0s, **options), t_eval)
+    data = mivp.solve(t_eval=t_eval, y0s=y0s, stream=True, **options)
+    assert data.shape == (len(t_eval), 2, 3)
+    assert np.abs(data - expected).max() < 1e-14
+
+
+def test_stream_failure():
+    # dy/dt = y^2 escapes to infinity at t = 1 from y = 1: nan frames
+    t = np.linspace(0.0, 2.0, 21)
+    data = mivp.solve(
+        fun=lambda t, y: y * y, t_eval=t, y0s=[[1.0], [-1.0]], stream=True, rtol=1e-8
+    )
+    assert np.all(np.isnan(data[t > 1.0, 0, 0]))
+    assert np.allclose(data[t < 0.95, 0, 0], 1.0 / (1.0 - t[t < 0.95]), rtol=1e-5)
+    assert np.allclose(data[:, 0, 1], -1.0 / (1.0 + t), rtol=1e-5)
+
+
+def test_stream_store(tmp_path):
+    t = np.linspace(0.0, np.pi, 11)
+    options = dict(fun=rotation, t_eval=t, y0s=[[1.0, 0.0]], stream=True)
+    filename = str(tmp_path / "data.npy")
+    data = mivp.solve(filename=filename, key="rotation", **options)
+    assert np.allclose(data[:, :, 0], np.array([np.cos(t), np.sin(t)]).T, atol=1e-2)
+    # Reused store: the field is not evaluated again
+    cached = mivp.solve(filename=filename, key="rotation", **dict(options, fun=None))
+    assert np.array_equal(cached, data)
+    with pytest.raises(TypeError):
+        mivp.solve(events=lambda t, y: y[0], **options)
@@ -0,0 +1,45 @@
+# Python Standard Library
+import shutil
+import subprocess
+
+# Third-Party Libraries
+import numpy as np
+import pytest
+
+# Local Library
+import mivp
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not found")
+
+
+def framemd5(filename):
+    "MD5 of each decoded frame"
+    cmd = ["ffmpeg", "-loglevel", "error", "-i", str(filename), "-f", "framemd5", "-"]
+    output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return [line.split(",")[-1].strip() for line in output.splitlines() if not line.startswith("#")]
+
+
+def test_parallel_movie_frames(tmp_path):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    theta = np.linspace(0.0, 2 * np.pi, 50)
+    data = np.array([
+        [(1.0 + 0.02 * k) * np.cos(theta + 0.1 * k), np.sin(theta) + 0.01 * k]
+        for k in range(25)
+    ])  # (25 frames, 2, 50 points)
+    digests = {}
+    for workers in [None, 2, 3]:
+        fig = plt.figure(figsize=(1.61, 1.01))  # odd frame size (161 x 101)
+        axes = fig.subplots()
+        axes.set_xlim(-2.0, 2.0)
+        axes.set_ylim(-2.0, 2.0)
+        filename = tmp_path / f"movie-{workers}.mp4"
+        mivp.generate_movie(data, str(filename), fps=10, axes=axes, dpi=100, workers=workers)
+        plt.close(fig)
+        digests[workers] = framemd5(filename)
+    assert len(digests[None]) == len(data)
+    assert digests[2] == digests[None]
+    assert digests[3] == digests[None]
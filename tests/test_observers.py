@@ -0,0 +1,73 @@
+# Third-Party Libraries
+import numpy as np
+import scipy.linalg as sla
+import scipy.signal as sig
+
+# Local Library
+import observers
+
+A = np.array([[0.0, 1.0], [-1.0, -0.2]])
+B = np.array([[0.0], [1.0]])
+C = np.array([[1.0, 0.0]])
+
+
+def test_observer_gain():
+    L = observers.observer_gain(A, C, [-2.0, -3.0])
+    assert np.allclose(np.sort(np.linalg.eigvals(A - L @ C).real), [-3.0, -2.0])
+
+
+def test_kalman_gain():
+    # Sigma solves A Sigma + Sigma A^t - Sigma C^t R C Sigma + Q^-1 = 0, L = Sigma C^t R
+    Q, R = np.diag([2.0, 0.5]), np.array([[4.0]])
+    L = observers.kalman_gain(A, C, Q, R)
+    Sigma = sla.solve_continuous_are(A.T, C.T, np.linalg.inv(Q), np.linalg.inv(R))
+    residual = A @ Sigma + Sigma @ A.T - Sigma @ C.T @ R @ C @ Sigma + np.linalg.inv(Q)
+    assert np.abs(residual).max() < 1e-12
+    assert np.allclose(L, Sigma @ C.T @ R, rtol=1e-14, atol=0.0)
+    assert np.all(np.linalg.eigvals(A - L @ C).real < 0.0)
+
+
+def test_simulate():
+    L = observers.observer_gain(A, C, [-2.0, -3.0])
+    t = np.linspace(0.0, 5.0, 101)
+    x0 = np.array([[1.0, 0.0], [0.0, -1.0], [2.0, 1.0]]).T  # (2, 3)
+    x_hat0 = np.zeros(2)
+    X = observers.simulate(A, B, C, L, t, x0, x_hat0)
+    assert X.shape == (len(t), 4, 3)
+    x, e = X[:, :2], X[:, 2:] - X[:, :2]
+    expm_A = np.array([sla.expm(A * t_) for t_ in t])
+    expm_E = np.array([sla.expm((A - L @ C) * t_) for t_ in t])
+    assert np.abs(x - expm_A @ x0).max() < 1e-13
+    assert np.abs(e - expm_E @ (x_hat0[:, np.newaxis] - x0)).max() < 1e-13
+
+    # Inputs: the reference is lsim on the joint dynamics
+    u = np.sin(t)[:, np.newaxis]
+    A_, B_ = observers.augmented(A, B, C, L)
+    X0 = np.r_[x0[:, 0], x_hat0]
+    _, _, expected = sig.lsim((A_, B_, np.eye(4), np.zeros((4, 1))), u, t, X0=X0, interp=False)
+    X = observers.simulate(A, B, C, L, t, x0[:, 0], x_hat0, u=u)
+    assert np.abs(X - expected).max() < 1e-13
+
+
+def test_error_covariance_without_noise():
+    L = observers.observer_gain(A, C, [-2.0, -3.0])
+    t = np.r_[np.linspace(0.0, 1.0, 11), np.linspace(1.5, 3.0, 4)]
+    P0 = np.array([[1.0, 0.3], [0.3, 2.0]])
+    P = observers.error_covariance(A, C, L, t, P0)
+    for t_, P_ in zip(t, P):
+        Phi = sla.expm((A - L @ C) * t_)
+        assert np.abs(P_ - Phi @ P0 @ Phi.T).max() < 1e-13
+
+
+def test_error_covariance_monte_carlo():
+    L = observers.kalman_gain(A, C, np.eye(2), np.eye(1))
+    t = np.linspace(0.0, 2.0, 21)
+    P0, V, W = np.eye(2), 0.1 * np.eye(2), np.array([[0.05]])
+    P = observers.error_covariance(A, C, L, t, P0, V=V, W=W)
+    mean, covariance = observers.error_statistics(
+        A, C, L, t, P0, 400_000, V=V, W=W, seed=0, chunk_size=50_000
+    )
+    assert np.abs(mean).max() < 0.01
+    # Sampling error of the covariances: about sqrt(2 / n_samples) = 0.2%
+    scale = np.sqrt(np.einsum("kii,kjj->kij", P, P))  # sqrt(P_ii P_jj)
+    assert np.all(np.abs(covariance - P) / scale < 0.01)
@@ -0,0 +1,28 @@
+# Third-Party Libraries
+import numpy as np
+import scipy.integrate as sci
+
+# Local Library
+from examples.pendulum import field, sweep
+
+b, l, u = [0.1, 0.5], [1.0, 2.0], [0.0, 1.0]
+t = np.linspace(0.0, 5.0, 11)
+
+
+def reference(b, l, u):
+    y = np.empty((len(t), 2, 2, 2, 2))
+    for i, j, k in np.ndindex(2, 2, 2):
+        fun = lambda t, y: field(t, y, b=b[i], l=l[j], u=u[k])
+        y[:, :, i, j, k] = sci.solve_ivp(
+            fun, (t[0], t[-1]), [0.0, 0.0], t_eval=t, rtol=1e-12, atol=1e-12
+        ).y.T
+    return y
+
+
+def test_sweep():
+    expected = reference(b, l, u)
+    data = sweep(b, l, u, t, rtol=1e-8, atol=1e-10)
+    assert data.shape == (len(t), 2, 2, 2, 2)
+    assert np.abs(data - expected).max() < 1e-6
+    chunks = sweep(b, l, u, t, rtol=1e-8, atol=1e-10, workers=2, chunk_size=3)
+    assert np.abs(chunks - expected).max() < 1e-6
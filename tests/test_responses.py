@@ -0,0 +1,61 @@
+# Third-Party Libraries
+import numpy as np
+import pytest
+import scipy.linalg as sla
+import scipy.signal as sig
+
+# Local Library
+import responses
+
+A = np.array([[0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [-2.0, -3.0, -1.0]])
+B = np.array([[0.0, 1.0], [0.0, 0.0], [1.0, 0.5]])
+C = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, -1.0]])
+D = np.array([[0.0, 0.0], [0.5, 0.0]])
+
+
+@pytest.mark.filterwarnings("ignore::scipy.signal.BadCoefficients")
+@pytest.mark.parametrize("method", ["hessenberg", "eig"])
+def test_frequency_response(method):
+    s = np.r_[1j * np.logspace(-2.0, 2.0, 101), -0.5 + 2.0j, 3.0]
+    H = responses.frequency_response(A, B, C, D, s, method=method, chunk_size=16)
+    expected = np.array([C @ np.linalg.solve(s_ * np.eye(3) - A, B) + D for s_ in s])
+    assert H.shape == (len(s), 2, 2)
+    assert np.abs(H - expected).max() < 1e-13 * np.abs(expected).max()
+    # scipy reference (first input only, through a polynomial transfer function)
+    _, H0 = sig.freqresp((A, B[:, :1], C[:1], D[:1, :1]), w=s[:101].imag)
+    assert np.allclose(H[:101, 0, 0], H0, rtol=1e-11, atol=0.0)
+
+
+def test_impulse_response():
+    t = np.linspace(0.0, 10.0, 201)
+    _, expected = sig.impulse((A, B[:, :1], C[:1], D[:1, :1]), T=t)
+    H = responses.impulse_response(A, B, C, t)
+    assert H.shape == (len(t), 2, 2)
+    assert np.abs(H[:, 0, 0] - expected).max() < 3e-15
+    H1 = responses.impulse_response(A, B, C, t[1:])  # t[0] != 0
+    assert np.abs(H1 - H[1:]).max() < 3e-15
+
+
+def test_step_response():
+    t = np.r_[np.linspace(0.0, 5.0, 101), np.linspace(5.5, 10.0, 10)]
+    Y = responses.step_response(A, B, C, D, t)
+    t_uniform = np.linspace(0.0, 5.0, 101)
+    for j in range(2):
+        _, expected = sig.step((A, B[:, j : j + 1], C, D[:, j : j + 1]), T=t_uniform)
+        assert np.abs(Y[:101, :, j] - expected).max() < 3e-15
+    # Direct solution: y(t) = C A^-1 (exp(A t) - I) B + D
+    for t_, Y_ in zip(t, Y):
+        expected = C @ np.linalg.solve(A, sla.expm(A * t_) - np.eye(3)) @ B + D
+        assert np.abs(Y_ - expected).max() < 1e-13
+
+
+def test_convolve():
+    rng = np.random.default_rng(0)
+    h, u = rng.standard_normal(300), rng.standard_normal(500)
+    expected = np.convolve(h, u)[:500] * 0.01
+    assert np.allclose(responses.convolve(h, u, 0.01), expected, rtol=0.0, atol=1e-13)
+    H, U = rng.standard_normal((300, 2, 3)), rng.standard_normal((500, 3))
+    Y = responses.convolve(H, U, 0.01)
+    for p in range(2):
+        expected = sum(np.convolve(H[:, p, m], U[:, m])[:500] for m in range(3)) * 0.01
+        assert np.allclose(Y[:, p], expected, rtol=0.0, atol=1e-13)
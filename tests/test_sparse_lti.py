@@ -0,0 +1,45 @@
+# Third-Party Libraries
+import numpy as np
+import pytest
+import scipy.linalg as sla
+
+# Local Library
+import sparse_lti
+
+
+def modal_dimension(A, B):
+    "Dimension of the controllable subspace of a symmetric system (reference)"
+    eigenvalues, V = sla.eigh(A)
+    splits = np.flatnonzero(np.diff(eigenvalues) > 1e-8) + 1
+    return sum(
+        np.linalg.matrix_rank(V[:, cluster].T @ B, tol=1e-8)
+        for cluster in np.split(np.arange(len(eigenvalues)), splits)
+    )
+
+
+@pytest.mark.parametrize("shape", [10, (3, 3), (10, 10), (20, 20)])
+def test_controllable_dimension(shape):
+    A, B, C = sparse_lti.heat(shape)
+    expected = modal_dimension(A.toarray(), B.toarray())
+    assert sparse_lti.controllable_dimension(A, B) == expected
+    assert sparse_lti.is_controllable(A, B) == (expected == A.shape[0])
+    assert sparse_lti.is_observable(A, C) == (expected == A.shape[0])
+
+
+def test_grid_is_not_controllable():
+    A, B, C = sparse_lti.heat((10, 10))  # symmetric w.r.t. the diagonal
+    assert sparse_lti.controllable_dimension(A, B) == 51
+    assert not sparse_lti.is_controllable(A, B)
+
+
+def test_controllable_dimension_nonsymmetric():
+    A, B, C = sparse_lti.heat((3, 3))
+    T = np.eye(9) + 0.1 * np.random.default_rng(0).standard_normal((9, 9))
+    A_, B_ = np.linalg.solve(T, A.toarray() @ T), np.linalg.solve(T, B.toarray())
+    assert sparse_lti.controllable_dimension(A_, B_) == 6
+
+
+def test_dense_methods_size_limit():
+    A, B, C = sparse_lti.heat((50, 50))
+    with pytest.raises(ValueError):
+        sparse_lti.is_controllable(A, B)
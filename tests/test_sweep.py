@@ -0,0 +1,30 @@
+# Third-Party Libraries
+import numpy as np
+import pytest
+
+# Local Library
+import sweep
+
+A = np.array([[[0.0, 1.0], [-a, 0.0]] for a in (1.0, 2.0, 3.0)])  # (3, 2, 2)
+B = np.array([[0.0], [1.0]])
+
+
+def test_lqr_per_design_system():
+    results = sweep.lqr(A, B, np.eye(2), np.eye(1))
+    assert results.shape == (3,)
+    for A_, result in zip(A, results):
+        (expected,) = sweep.lqr(A_, B, np.eye(2), np.eye(1))
+        assert np.allclose(result["K"], expected["K"])
+
+
+def test_place_per_design_system():
+    results = sweep.place(A, B, [-1.0, -2.0])
+    for result in results:
+        assert np.allclose(result["eigenvalues"], [-2.0, -1.0])
+
+
+def test_inconsistent_numbers_of_designs():
+    with pytest.raises(ValueError):
+        sweep.lqr(A, B, [np.eye(2)] * 2, np.eye(1))
+    with pytest.raises(ValueError):
+        sweep.place(A, B, [[-1.0, -2.0], [-2.0, -3.0]])
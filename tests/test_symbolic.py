@@ -0,0 +1,65 @@
+# Third-Party Libraries
+import numpy as np
+import pytest
+import sympy
+from sympy.utilities.lambdify import implemented_function
+
+# Local Library
+import symbolic
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(symbolic, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(symbolic, "_results", {})
+    monkeypatch.setattr(symbolic, "_functions", {})
+
+
+def test_memoize():
+    calls = []
+
+    def laplace_transform(f, t, s):
+        calls.append(f)
+        return sympy.laplace_transform(f, t, s, noconds=True)
+
+    memoized = symbolic.memoize(laplace_transform)
+    t, s = sympy.symbols("t s", positive=True)
+    expected = sympy.laplace_transform(sympy.exp(-2 * t) * sympy.sin(t), t, s, noconds=True)
+    result = memoized(sympy.exp(-2 * t) * sympy.sin(t), t, s)
+    assert sympy.simplify(result - expected) == 0
+    # Structurally identical arguments (new objects): no new computation
+    t_, s_ = sympy.symbols("t s", positive=True)
+    assert memoized(sympy.exp(-2 * t_) * sympy.sin(t_), t_, s_) == result
+    assert len(calls) == 1
+    # Different assumptions, different structure
+    memoized(sympy.exp(-2 * sympy.Symbol("t")) * sympy.sin(t), t, s)
+    assert len(calls) == 2
+    # Disk cache
+    symbolic._results.clear()
+    assert memoized(sympy.exp(-2 * t) * sympy.sin(t), t, s) == result
+    assert len(calls) == 2
+
+
+def test_lambdify():
+    x, y = sympy.symbols("x y")
+    expr = sympy.exp(-x) * sympy.cos(y) + x**2
+    X, Y = np.meshgrid(np.linspace(-1.0, 1.0, 5), np.linspace(0.0, 3.0, 4))
+    expected = sympy.lambdify((x, y), expr)(X, Y)
+    f = symbolic.lambdify((x, y), expr)
+    assert np.array_equal(f(X, Y), expected)
+    assert symbolic.lambdify((x, y), sympy.exp(-x) * sympy.cos(y) + x**2) is f
+    # Compiled again from the source stored on disk
+    symbolic._functions.clear()
+    g = symbolic.lambdify((x, y), expr)
+    assert g is not f
+    assert np.array_equal(g(X, Y), expected)
+
+
+def test_lambdify_user_function(tmp_path):
+    x = sympy.Symbol("x")
+    f = implemented_function("f", lambda x: 2.0 * x)
+    h = symbolic.lambdify([x], f(x) + 1)
+    assert h(3.0) == 7.0
+    assert not (tmp_path / "functions").exists()  # the implementation cannot be stored
+    symbolic._functions.clear()
+    assert symbolic.lambdify([x], f(x) + 1)(3.0) == 7.0